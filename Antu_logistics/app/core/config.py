@@ -1,9 +1,14 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 0
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_PGBOUNCER: bool = False  # transaction-mode pgbouncer in front of Postgres
+    DB_QUERY_CACHE_SIZE: int = 1200  # compiled statements kept per engine
     
     # Security
     SECRET_KEY: str
@@ -14,6 +19,9 @@ class Settings(BaseSettings):
     APP_NAME: str = "Antu Logistics System"
     DEBUG: bool = True
     
+    # CORS: browser origins allowed to call the API (JSON list in .env)
+    CORS_ORIGINS: List[str] = ["http://localhost:3000"]
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,8 +1,9 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import UUID
-from app.database import get_db
+from app.database import get_async_db
 from app.core.security import decode_access_token
 from app.models.user_model import User, UserRole
 from typing import Optional
@@ -10,10 +11,21 @@ from typing import Optional
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
-    """Get the current authenticated user"""
+    """
+    Get the current authenticated user
+    
+    FastAPI already runs this once per request for every Depends(get_current_user)
+    in the graph (role checks included); the user is also kept on
+    request.state.user for code that only has the request.
+    """
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,7 +41,7 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if user is None:
         raise credentials_exception
     
@@ -39,8 +51,26 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    request.state.user = user
     return user
 
+async def get_token_role(token: str = Depends(oauth2_scheme)) -> UserRole:
+    """
+    Get the role claim of a valid access token without loading the user
+    
+    For endpoints that read no user data. A deactivated user keeps this
+    access until the token expires.
+    """
+    payload = decode_access_token(token)
+    try:
+        return UserRole(payload["role"])
+    except (TypeError, KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -1,11 +1,44 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL , echo=settings.DEBUG)
+# Pool settings are per worker process; size them so that
+# workers * (pool_size + max_overflow) stays under Postgres/pgbouncer limits
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
+
+# Compiled SQL is cached per statement shape and reused across calls with
+# new bound values; the default 500 entries is too few for the analytics and
+# tracking queries plus all their ORM variants
+QUERY_CACHE_SIZE = settings.DB_QUERY_CACHE_SIZE
+
+engine = create_engine(settings.DATABASE_URL , echo=settings.DEBUG, query_cache_size=QUERY_CACHE_SIZE, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# pgbouncer in transaction mode can hand each transaction a different server
+# connection, so asyncpg must not rely on server-side prepared statements
+async_connect_args = (
+    {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    if settings.DB_PGBOUNCER else {}
+)
+
+# Async engine on the same database, driven by asyncpg
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    echo=settings.DEBUG,
+    connect_args=async_connect_args,
+    query_cache_size=QUERY_CACHE_SIZE,
+    **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency to get DB session
@@ -14,4 +47,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
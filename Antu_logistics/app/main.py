@@ -1,27 +1,49 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.database import engine, Base
+from app.database import get_async_db
 from app.routes import auth , analytics , tracking , vehicle , shipment , driver
+from app.services.tracking_service import flush_pending_tracking_points, run_tracking_flusher
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Batches queued GPS pings into the database for this worker
+    flusher = asyncio.create_task(run_tracking_flusher())
+    yield
+    flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await flusher
+    await flush_pending_tracking_points()
 
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     description="A logistics management system for real-time shipment tracking",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware - configure for production
+# CORS middleware - explicit origins from settings
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Change this in production to specific origins
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (tracking summaries, shipment pages); small
+# responses are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(analytics.router)
@@ -41,5 +63,14 @@ def root():
 
 @app.get("/health")
 def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy"}
\ No newline at end of file
+    """Liveness check; static so it never touches the database"""
+    return {"status": "healthy"}
+
+@app.get("/health/db")
+async def database_health_check(db: AsyncSession = Depends(get_async_db)):
+    """Readiness check: the database answers SELECT 1 within 500ms"""
+    try:
+        await asyncio.wait_for(db.execute(text("SELECT 1")), timeout=0.5)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "healthy", "database": "ok"}
\ No newline at end of file
@@ -1,3 +1,5 @@
+from sqlalchemy.orm import configure_mappers
+
 from .user_model import User, UserRole
 from .vehicle_model import Vehicle, VehicleStatus, VehicleType
 from .driver_model import Driver, DriverStatus
@@ -15,4 +17,8 @@ __all__ = [
     "Shipment",
     "ShipmentStatus",
     "TrackingPoint",
-]
\ No newline at end of file
+]
+
+# Resolve string relationship targets once at import so a bad mapping fails
+# at startup rather than on the first request that touches it
+configure_mappers()
@@ -1,11 +1,10 @@
 from geoalchemy2 import Geography
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Boolean
+from sqlalchemy import Column, String, ForeignKey, DateTime, Enum, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import UUID
 import enum
 from app.database import Base
-import uuid
 
 class DriverStatus(str, enum.Enum):
     AVAILABLE = "available"
@@ -15,9 +14,9 @@ class DriverStatus(str, enum.Enum):
 class Driver(Base):
     __tablename__ = "drivers"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
-    vehicle_id = Column(Integer, ForeignKey("vehicles.id"), nullable=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
+    vehicle_id = Column(UUID(as_uuid=True), ForeignKey("vehicles.id"), nullable=True)
     license_number = Column(String, unique=True, nullable=False)
     status = Column(Enum(DriverStatus), default=DriverStatus.OFF_DUTY)
     location=Column(Geography(geometry_type="POINT", srid=4326), nullable=True)
@@ -27,6 +26,11 @@ class Driver(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="driver_profile")
+    user = relationship("User", back_populates="driver_profile", lazy="joined")
     vehicle = relationship("Vehicle", back_populates="drivers")
     shipments = relationship("Shipment", back_populates="driver")
+    
+    __table_args__ = (
+        # Active fleet counts per status (calculate_fleet_efficiency)
+        Index("ix_drivers_active_status", is_active, status),
+    )
@@ -1,11 +1,10 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, Enum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Numeric, ForeignKey, DateTime, Enum, Text, Index, cast, func, text
+from sqlalchemy.orm import column_property, deferred, relationship
 from datetime import datetime
-from geoalchemy2 import Geography
+from geoalchemy2 import Geography, Geometry
 import enum
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
-import uuid
 from datetime import datetime, timezone
 
 class ShipmentStatus(str, enum.Enum):
@@ -19,16 +18,27 @@ class ShipmentStatus(str, enum.Enum):
 class Shipment(Base):
     __tablename__ = "shipments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     tracking_number = Column(String, unique=True, index=True, nullable=False)
-    shipper_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    driver_id = Column(Integer, ForeignKey("drivers.id"), nullable=True)
+    shipper_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    driver_id = Column(UUID(as_uuid=True), ForeignKey("drivers.id"), nullable=True)
     
     # Origin details
     origin = Column(Geography(geometry_type="POINT", srid=4326), nullable=False)
+    origin_latitude = column_property(func.ST_Y(cast(origin, Geometry(srid=4326))))
+    origin_longitude = column_property(func.ST_X(cast(origin, Geometry(srid=4326))))
     
     # Destination details
     destination = Column(Geography(geometry_type="POINT", srid=4326), nullable=False)
+    destination_latitude = column_property(func.ST_Y(cast(destination, Geometry(srid=4326))))
+    destination_longitude = column_property(func.ST_X(cast(destination, Geometry(srid=4326))))
+    
+    # Straight origin -> destination line, maintained by Postgres (migration 0012);
+    # deferred since only route deviation reads it
+    route = deferred(Column(
+        Geography(geometry_type="LINESTRING", srid=4326, spatial_index=False),
+        Computed("ST_MakeLine(origin::geometry, destination::geometry)::geography", persisted=True)
+    ))
     
     # Shipment details
     package_description = Column(Text)
@@ -40,6 +50,8 @@ class Shipment(Base):
     estimated_distance_km = Column(Numeric(10, 2), nullable=True)
     estimated_cost = Column(Numeric(10, 2), nullable=True)
     actual_cost = Column(Numeric(10, 2), nullable=True)
+    # Revenue of the shipment: actual cost, falling back to the estimate
+    effective_cost = column_property(func.coalesce(actual_cost, estimated_cost, 0), deferred=True)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -54,5 +66,24 @@ class Shipment(Base):
     
     # Relationships
     customer = relationship("User", back_populates="shipments_as_customer", foreign_keys=[shipper_id])
-    driver = relationship("Driver", back_populates="shipments")
-    tracking_points = relationship("TrackingPoint", back_populates="shipment", cascade="all, delete-orphan")
+    driver = relationship("Driver", back_populates="shipments", lazy="joined")
+    tracking_points = relationship("TrackingPoint", back_populates="shipment", lazy="selectin", cascade="all, delete-orphan", order_by="TrackingPoint.recorded_at")
+    
+    __table_args__ = (
+        # Newest-first listing per shipper / driver / status (list_shipments)
+        Index("ix_shipments_shipper_created", shipper_id, created_at.desc()),
+        Index("ix_shipments_driver_created", driver_id, created_at.desc()),
+        Index("ix_shipments_status_created", status, created_at.desc()),
+        # Delivery timings (analyze_delivery_performance)
+        Index(
+            "ix_shipments_delivered_times", picked_up_at, delivered_at,
+            postgresql_where=status == ShipmentStatus.DELIVERED,
+        ),
+        # Per-driver workload and daily summary (driver_service)
+        Index(
+            "ix_shipments_driver_status", driver_id, status,
+            postgresql_include=["estimated_distance_km"],
+        ),
+        Index("ix_shipments_driver_picked_up", driver_id, picked_up_at),
+        Index("ix_shipments_driver_delivered", driver_id, delivered_at),
+    )
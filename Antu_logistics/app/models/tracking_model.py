@@ -1,20 +1,36 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Index, cast, func, text
+from sqlalchemy.orm import column_property, relationship
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import UUID
-from geoalchemy2 import Geography
+from geoalchemy2 import Geography, Geometry
 from app.database import Base
-import uuid
 
 class TrackingPoint(Base):
     __tablename__ = "tracking_points"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
     shipment_id = Column(UUID(as_uuid=True), ForeignKey("shipments.id"), nullable=False)
     location = Column(Geography(geometry_type='POINT', srid=4326), nullable=False)  # GPS coordinates
     speed_kmh = Column(Float, nullable=True)  # Speed at this point
     recorded_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     notes = Column(String, nullable=True)  # e.g., "Delayed due to traffic"
     
+    # Coordinates unpacked from location in SQL, so reads can skip the WKB
+    latitude = column_property(func.ST_Y(cast(location, Geometry(srid=4326))))
+    longitude = column_property(func.ST_X(cast(location, Geometry(srid=4326))))
+    
     # Relationships
     shipment = relationship("Shipment", back_populates="tracking_points")
+    
+    __table_args__ = (
+        # Geohash order keeps nearby points on the same heap pages once the
+        # table is CLUSTERed on this index (see migration 0002)
+        Index("tp_geohash_idx", func.ST_GeoHash(cast(location, Geometry(srid=4326)), 10)),
+        # Per-shipment reads in recording order (see migration 0011)
+        Index(
+            "ix_tracking_points_shipment_recorded",
+            "shipment_id",
+            "recorded_at",
+            postgresql_include=["speed_kmh"],
+        ),
+    )
@@ -1,9 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import enum
-import uuid
 from app.database import Base
 
 class UserRole(str, enum.Enum):
@@ -15,7 +14,7 @@ class UserRole(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     phone = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     full_name = Column(String, nullable=False)
@@ -27,4 +26,4 @@ class User(Base):
 
     # Relationships
     driver_profile = relationship("Driver", back_populates="user", uselist=False)
-    shipments_as_customer = relationship("Shipment", back_populates="customer", foreign_keys="Shipper_id")
\ No newline at end of file
+    shipments_as_customer = relationship("Shipment", back_populates="customer", foreign_keys="Shipment.shipper_id")
\ No newline at end of file
@@ -1,10 +1,9 @@
-from sqlalchemy import Column, Integer, Numeric, String, Float, DateTime, Enum, Boolean
+from sqlalchemy import Column, Integer, Numeric, String, Float, DateTime, Enum, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import UUID
 import enum
 from app.database import Base
-import uuid
 
 class VehicleStatus(str, enum.Enum):
     AVAILABLE = "available"
@@ -21,7 +20,7 @@ class VehicleType(str, enum.Enum):
 class Vehicle(Base):
     __tablename__ = "vehicles"
     
-    id =  Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id =  Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     plate_number = Column(String, unique=True, index=True, nullable=False)
     vehicle_type = Column(Enum(VehicleType), nullable=False)
     model = Column(String)
@@ -33,4 +32,9 @@ class Vehicle(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    drivers = relationship("Driver", back_populates="vehicle")
+    drivers = relationship("Driver", back_populates="vehicle", lazy="selectin")
+    
+    __table_args__ = (
+        # Active fleet counts per status (calculate_fleet_efficiency)
+        Index("ix_vehicles_active_status", is_active, status),
+    )
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_async_db
 from app.core.deps import get_current_user  # adjust if your dependency path differs
 from app.models.user_model import User, UserRole
 
@@ -39,12 +39,12 @@ def require_admin_or_manager(current_user: User = Depends(get_current_user)):
 # ----------------------------------------
 
 @router.get("/revenue-forecast")
-def revenue_forecast(
+async def revenue_forecast(
     days_ahead: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return calculate_revenue_forecast(db, days_ahead)
+    return await calculate_revenue_forecast(db, days_ahead)
 
 
 # ----------------------------------------
@@ -52,11 +52,11 @@ def revenue_forecast(
 # ----------------------------------------
 
 @router.get("/peak-hours")
-def peak_hours(
-    db: Session = Depends(get_db),
+async def peak_hours(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return analyze_peak_hours(db)
+    return await analyze_peak_hours(db)
 
 
 # ----------------------------------------
@@ -64,12 +64,12 @@ def peak_hours(
 # ----------------------------------------
 
 @router.get("/customer/{shipper_id}/lifetime-value")
-def customer_lifetime_value(
+async def customer_lifetime_value(
     shipper_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return calculate_customer_lifetime_value(shipper_id, db)
+    return await calculate_customer_lifetime_value(shipper_id, db)
 
 
 # ----------------------------------------
@@ -77,11 +77,11 @@ def customer_lifetime_value(
 # ----------------------------------------
 
 @router.get("/delivery-performance")
-def delivery_performance(
-    db: Session = Depends(get_db),
+async def delivery_performance(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return analyze_delivery_performance(db)
+    return await analyze_delivery_performance(db)
 
 
 # ----------------------------------------
@@ -89,11 +89,11 @@ def delivery_performance(
 # ----------------------------------------
 
 @router.get("/geographic-insights")
-def geographic_insights(
-    db: Session = Depends(get_db),
+async def geographic_insights(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return get_geographic_insights(db)
+    return await get_geographic_insights(db)
 
 
 # ----------------------------------------
@@ -101,11 +101,11 @@ def geographic_insights(
 # ----------------------------------------
 
 @router.get("/fleet-efficiency")
-def fleet_efficiency(
-    db: Session = Depends(get_db),
+async def fleet_efficiency(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return calculate_fleet_efficiency(db)
+    return await calculate_fleet_efficiency(db)
 
 
 # ----------------------------------------
@@ -113,11 +113,11 @@ def fleet_efficiency(
 # ----------------------------------------
 
 @router.get("/executive-summary")
-def executive_summary(
-    db: Session = Depends(get_db),
+async def executive_summary(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return generate_executive_summary(db)
+    return await generate_executive_summary(db)
 
 
 # ----------------------------------------
@@ -125,8 +125,8 @@ def executive_summary(
 # ----------------------------------------
 
 @router.get("/business-opportunities")
-def business_opportunities(
-    db: Session = Depends(get_db),
+async def business_opportunities(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin_or_manager)
 ):
-    return identify_business_opportunities(db)
+    return await identify_business_opportunities(db)
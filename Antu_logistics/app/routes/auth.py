@@ -75,11 +75,7 @@ def login(
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get current user information"""
-    return current_user
-
-# Import after function definitions to avoid circular import
-from app.core.deps import get_current_user
\ No newline at end of file
+    return current_user
\ No newline at end of file
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.core.deps import get_current_user
 from app.models.user_model import User, UserRole
+from app.schemas.tracking import TrackingPointCreate
 
 from app.services.driver_service import (
     calculate_driver_efficiency_score,
@@ -19,19 +21,22 @@ from app.services.driver_service import (
     find_nearest_available_driver,
     get_driver_performance_trends
 )
+from app.services.tracking_service import save_tracking_points_batch
 
 router = APIRouter(
     prefix="/driver-analytics",
     tags=["Driver Analytics"]
 )
 
+MAX_LOCATION_BATCH = 1000
+
 
 # ----------------------------------------
 # Role Protection
 # ----------------------------------------
 
 def require_staff(current_user: User = Depends(get_current_user)):
-    if current_user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
+    if current_user.role not in [UserRole.ADMIN, UserRole.LOGISTICS_MANAGER]:
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
@@ -82,6 +87,30 @@ def update_location(
     }
 
 
+# ----------------------------------------
+# Batch Location Ingest
+# ----------------------------------------
+
+@router.post("/location/batch")
+async def ingest_location_batch(
+    pings: List[TrackingPointCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_staff)
+):
+    if len(pings) > MAX_LOCATION_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_LOCATION_BATCH} pings per batch"
+        )
+
+    inserted = await save_tracking_points_batch(db, pings)
+
+    return {
+        "inserted": inserted,
+        "message": "Tracking points saved successfully"
+    }
+
+
 # ----------------------------------------
 # ETA Calculation
 # ----------------------------------------
@@ -148,15 +177,15 @@ def driver_daily_summary(
 # ----------------------------------------
 
 @router.get("/nearest-driver")
-def nearest_driver(
+async def nearest_driver(
     origin_lat: float,
     origin_lng: float,
     shipment_weight_kg: Decimal,
     max_distance_km: Decimal = 50,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    result = find_nearest_available_driver(
+    result = await find_nearest_available_driver(
         origin_lat,
         origin_lng,
         shipment_weight_kg,
@@ -1,28 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from geoalchemy2 import Geometry
+from sqlalchemy import bindparam, cast, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload, selectinload
+from typing import Optional
 from datetime import datetime
 from uuid import UUID
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user_model import User, UserRole
 from app.models.shipment_model import Shipment, ShipmentStatus
 from app.models.driver_model import Driver
-from app.schemas.shipment import ShipmentCreate, ShipmentUpdate, ShipmentRead as ShipmentResponse
+from app.models.tracking_model import TrackingPoint
+from app.schemas.shipment import ShipmentCreate, ShipmentUpdate, ShipmentRead as ShipmentResponse, ShipmentPage, shipment_adapter, shipment_list_adapter
 from app.core.deps import get_current_user, require_role
 from app.services.shipments_service import (
     generate_tracking_number,
     calculate_distance_km,
     calculate_delivery_cost,
-    validate_coordinates
+    validate_coordinates,
+    encode_shipment_cursor,
+    decode_shipment_cursor,
+    geography_point
 )
+from app.services.analytics_service import ANALYTICS_CACHE
+from app.services.driver_service import invalidate_driver_workload
+from app.services.vehicle_service import VEHICLE_CACHE
+from app.services.tracking_service import TRACKING_CACHE
+from app.services._cache import clear_cache
 
 router = APIRouter(prefix="/shipments", tags=["Shipments"])
 
+# Columns ShipmentResponse needs for the listing, coordinates unpacked in SQL.
+# Tracking points are left to the detail endpoint.
+SHIPMENT_LIST_COLS = (
+    Shipment.id,
+    Shipment.tracking_number,
+    Shipment.shipper_id,
+    Shipment.driver_id,
+    func.ST_Y(cast(Shipment.origin, Geometry(srid=4326))).label("origin_latitude"),
+    func.ST_X(cast(Shipment.origin, Geometry(srid=4326))).label("origin_longitude"),
+    func.ST_Y(cast(Shipment.destination, Geometry(srid=4326))).label("destination_latitude"),
+    func.ST_X(cast(Shipment.destination, Geometry(srid=4326))).label("destination_longitude"),
+    Shipment.package_description,
+    Shipment.weight_kg,
+    Shipment.volume_m3,
+    Shipment.status,
+    Shipment.estimated_distance_km,
+    Shipment.estimated_cost,
+    Shipment.actual_cost,
+    Shipment.recipient_name,
+    Shipment.recipient_phone,
+    Shipment.created_at,
+    Shipment.assigned_at,
+    Shipment.picked_up_at,
+    Shipment.delivered_at,
+    Shipment.updated_at,
+)
+
+# Detail endpoints load tracking points in one follow-up query, without the
+# location WKB that TrackingPointRead never reads
+TRACKING_POINTS_FOR_READ = selectinload(Shipment.tracking_points).load_only(
+    TrackingPoint.id,
+    TrackingPoint.shipment_id,
+    TrackingPoint.latitude,
+    TrackingPoint.longitude,
+    TrackingPoint.speed_kmh,
+    TrackingPoint.recorded_at,
+    TrackingPoint.notes,
+)
+
+# One shipment by id, built once with the id as a bind parameter so every
+# request reuses the same statement and its compiled SQL. ShipmentResponse
+# never reads the driver, so the mapper's joined load is skipped.
+_SHIPMENT_BY_ID = select(Shipment).where(
+    Shipment.id == bindparam("shipment_id")
+).options(lazyload(Shipment.driver))
+SHIPMENT_FOR_READ = _SHIPMENT_BY_ID.options(TRACKING_POINTS_FOR_READ)
+SHIPMENT_FOR_CANCEL = _SHIPMENT_BY_ID.options(lazyload(Shipment.tracking_points))
+
+async def load_shipment(db: AsyncSession, shipment_id: UUID, statement=SHIPMENT_FOR_READ) -> Optional[Shipment]:
+    """Run one of the by-id statements above"""
+    return (await db.execute(statement, {"shipment_id": shipment_id})).scalar_one_or_none()
+
+async def reload_shipment(db: AsyncSession, shipment_id: UUID) -> Shipment:
+    """Re-read a shipment after commit, overwriting the stale identity-map copy"""
+    return (await db.execute(
+        SHIPMENT_FOR_READ.execution_options(populate_existing=True),
+        {"shipment_id": shipment_id}
+    )).scalar_one()
+
+def shipment_json(shipment: Shipment) -> Response:
+    """
+    Render a shipment straight to JSON bytes
+    
+    Skips FastAPI's response_model round trip; the route's response_model
+    still documents the schema.
+    """
+    return Response(
+        content=shipment_adapter.dump_json(
+            shipment_adapter.validate_python(shipment, from_attributes=True)
+        ),
+        media_type="application/json"
+    )
+
 @router.post("/", response_model=ShipmentResponse, status_code=status.HTTP_201_CREATED)
-def create_shipment(
+async def create_shipment(
     shipment_data: ShipmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -31,13 +116,13 @@ def create_shipment(
     - Admins can create shipments for any customer
     """
     # Validate coordinates
-    if not validate_coordinates(shipment_data.origin):
+    if not validate_coordinates(shipment_data.origin_latitude, shipment_data.origin_longitude):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid origin coordinates"
         )
     
-    if not validate_coordinates(shipment_data.destination):
+    if not validate_coordinates(shipment_data.destination_latitude, shipment_data.destination_longitude):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid destination coordinates"
@@ -45,8 +130,10 @@ def create_shipment(
     
     # Calculate distance
     distance = calculate_distance_km(
-        shipment_data.origin,
-        shipment_data.destination  
+        shipment_data.origin_latitude,
+        shipment_data.origin_longitude,
+        shipment_data.destination_latitude,
+        shipment_data.destination_longitude
     )
     
     # Calculate estimated cost
@@ -58,10 +145,9 @@ def create_shipment(
     # Create shipment
     new_shipment = Shipment(
         tracking_number=generate_tracking_number(),
-        customer_id=current_user.id,
-
-        origin_address=shipment_data.origin,
-        destination_address=shipment_data.destination,
+        shipper_id=current_user.id,
+        origin=geography_point(shipment_data.origin_latitude, shipment_data.origin_longitude),
+        destination=geography_point(shipment_data.destination_latitude, shipment_data.destination_longitude),
         package_description=shipment_data.package_description,
         weight_kg=shipment_data.weight_kg,
         volume_m3=shipment_data.volume_m3,
@@ -73,17 +159,18 @@ def create_shipment(
     )
     
     db.add(new_shipment)
-    db.commit()
-    db.refresh(new_shipment)
+    await db.commit()
+    clear_cache(ANALYTICS_CACHE)
+    await db.refresh(new_shipment)
     
     return new_shipment
 
-@router.get("/", response_model=List[ShipmentResponse])
-def list_shipments(
+@router.get("/", response_model=ShipmentPage)
+async def list_shipments(
     status_filter: Optional[ShipmentStatus] = Query(None, description="Filter by status"),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -91,41 +178,65 @@ def list_shipments(
     - Customers see only their shipments
     - Drivers see only assigned shipments
     - Admins see all shipments
+    - Pages are newest first; pass next_cursor back as cursor for the next page
     """
-    query = db.query(Shipment)
+    # Plain column rows: no ORM identity map, no relationship loading
+    query = select(*SHIPMENT_LIST_COLS)
     
     # Apply role-based filtering
     if current_user.role == UserRole.CUSTOMER:
-        query = query.filter(Shipment.shipper_id == current_user.id)
+        query = query.where(Shipment.shipper_id == current_user.id)
     elif current_user.role == UserRole.DRIVER:
         # Get driver profile
-        driver = db.query(Driver).filter(Driver.user_id == current_user.id).first()
+        driver = await db.scalar(select(Driver).where(Driver.user_id == current_user.id))
         if driver:
-            query = query.filter(Shipment.driver_id == driver.id)
+            query = query.where(Shipment.driver_id == driver.id)
         else:
-            return []  # Driver has no profile yet
+            return ShipmentPage(items=[])  # Driver has no profile yet
     
     # Apply status filter if provided
     if status_filter:
-        query = query.filter(Shipment.status == status_filter)
+        query = query.where(Shipment.status == status_filter)
+    
+    # Apply keyset pagination: seek past the last row of the previous page
+    if cursor:
+        try:
+            last_created_at, last_id = decode_shipment_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(tuple_(Shipment.created_at, Shipment.id) < (last_created_at, last_id))
+    
+    rows = (await db.execute(
+        query.order_by(Shipment.created_at.desc(), Shipment.id.desc()).limit(limit)
+    )).all()
     
-    # Apply pagination
-    shipments = query.order_by(Shipment.created_at.desc()).offset(skip).limit(limit).all()
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_shipment_cursor(last.created_at, last.id)
     
-    return shipments
+    return ShipmentPage(
+        items=shipment_list_adapter.validate_python(rows, from_attributes=True),
+        next_cursor=next_cursor
+    )
 
 @router.get("/tracking/{tracking_number}", response_model=ShipmentResponse)
-def track_shipment_by_number(
+async def track_shipment_by_number(
     tracking_number: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Track a shipment by tracking number (public endpoint - no auth required for now)
     In production, you might want to add a verification code
     """
-    shipment = db.query(Shipment).filter(
-        Shipment.tracking_number == tracking_number
-    ).first()
+    shipment = await db.scalar(
+        select(Shipment)
+        .where(Shipment.tracking_number == tracking_number)
+        .options(lazyload(Shipment.driver), TRACKING_POINTS_FOR_READ)
+    )
     
     if not shipment:
         raise HTTPException(
@@ -133,16 +244,16 @@ def track_shipment_by_number(
             detail="Shipment not found"
         )
     
-    return shipment
+    return shipment_json(shipment)
 
 @router.get("/{shipment_id}", response_model=ShipmentResponse)
-def get_shipment(
+async def get_shipment(
     shipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific shipment by ID"""
-    shipment = db.query(Shipment).filter(Shipment.id == shipment_id).first()
+    shipment = await load_shipment(db, shipment_id)
     
     if not shipment:
         raise HTTPException(
@@ -158,20 +269,20 @@ def get_shipment(
         )
     
     if current_user.role == UserRole.DRIVER:
-        driver = db.query(Driver).filter(Driver.user_id == current_user.id).first()
+        driver = await db.scalar(select(Driver).where(Driver.user_id == current_user.id))
         if not driver or shipment.driver_id != driver.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to view this shipment"
             )
     
-    return shipment
+    return shipment_json(shipment)
 
 @router.put("/{shipment_id}", response_model=ShipmentResponse)
-def update_shipment(
+async def update_shipment(
     shipment_id: UUID,
     update_data: ShipmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.DRIVER]))
 ):
     """
@@ -179,7 +290,7 @@ def update_shipment(
     - Admins can update any field
     - Drivers can only update status
     """
-    shipment = db.query(Shipment).filter(Shipment.id == shipment_id).first()
+    shipment = await load_shipment(db, shipment_id)
     
     if not shipment:
         raise HTTPException(
@@ -189,13 +300,15 @@ def update_shipment(
     
     # If driver, verify they're assigned to this shipment
     if current_user.role == UserRole.DRIVER:
-        driver = db.query(Driver).filter(Driver.user_id == current_user.id).first()
+        driver = await db.scalar(select(Driver).where(Driver.user_id == current_user.id))
         if not driver or shipment.driver_id != driver.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to update this shipment"
             )
     
+    previous_driver_id = shipment.driver_id
+    
     # Update fields
     if update_data.status is not None:
         shipment.status = update_data.status
@@ -208,7 +321,7 @@ def update_shipment(
     
     if update_data.driver_id is not None and current_user.role == UserRole.ADMIN:
         # Verify driver exists
-        driver = db.query(Driver).filter(Driver.id == update_data.driver_id).first()
+        driver = await db.scalar(select(Driver).where(Driver.id == update_data.driver_id))
         if not driver:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -221,15 +334,18 @@ def update_shipment(
     if update_data.actual_cost is not None and current_user.role == UserRole.ADMIN:
         shipment.actual_cost = update_data.actual_cost
     
-    db.commit()
-    db.refresh(shipment)
+    await db.commit()
+    clear_cache(ANALYTICS_CACHE)
+    clear_cache(TRACKING_CACHE)
+    clear_cache(VEHICLE_CACHE)
+    invalidate_driver_workload(previous_driver_id, shipment.driver_id)
     
-    return shipment
+    return await reload_shipment(db, shipment_id)
 
 @router.delete("/{shipment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def cancel_shipment(
+async def cancel_shipment(
     shipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.LOGISTICS_MANAGER, UserRole.CUSTOMER]))
 ):
     """
@@ -237,7 +353,7 @@ def cancel_shipment(
     - Customers can cancel their own pending shipments
     - Admins can cancel any shipment
     """
-    shipment = db.query(Shipment).filter(Shipment.id == shipment_id).first()
+    shipment = await load_shipment(db, shipment_id, SHIPMENT_FOR_CANCEL)
     
     if not shipment:
         raise HTTPException(
@@ -259,28 +375,31 @@ def cancel_shipment(
             )
     
     shipment.status = ShipmentStatus.CANCELLED
-    db.commit()
+    await db.commit()
+    clear_cache(ANALYTICS_CACHE)
+    clear_cache(TRACKING_CACHE)
+    invalidate_driver_workload(shipment.driver_id)
     
     return None
 
 @router.post("/{shipment_id}/assign", response_model=ShipmentResponse)
-def assign_driver_to_shipment(
+async def assign_driver_to_shipment(
     shipment_id: UUID,
     driver_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_role([UserRole.ADMIN]))
 ):
     """
     Assign a driver to a shipment (Admin only)
     """
-    shipment = db.query(Shipment).filter(Shipment.id == shipment_id).first()
+    shipment = await load_shipment(db, shipment_id)
     if not shipment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shipment not found"
         )
     
-    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    driver = await db.scalar(select(Driver).where(Driver.id == driver_id))
     if not driver:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -293,11 +412,15 @@ def assign_driver_to_shipment(
             detail="Driver is not active"
         )
     
+    previous_driver_id = shipment.driver_id
     shipment.driver_id = driver_id
     shipment.assigned_at = datetime.utcnow()
     shipment.status = ShipmentStatus.ASSIGNED
     
-    db.commit()
-    db.refresh(shipment)
+    await db.commit()
+    clear_cache(ANALYTICS_CACHE)
+    clear_cache(TRACKING_CACHE)
+    clear_cache(VEHICLE_CACHE)
+    invalidate_driver_workload(previous_driver_id, driver_id)
     
-    return shipment
\ No newline at end of file
+    return await reload_shipment(db, shipment_id)
\ No newline at end of file
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import Optional
 
-from app.database import get_db
-from app.core.deps import get_current_user
+from app.database import get_async_db
+from app.core.deps import get_current_user, get_token_role
 from app.models.user_model import User, UserRole
 
 from app.services.tracking_service import (
@@ -30,31 +30,40 @@ router = APIRouter(
 # Role Protection
 # ----------------------------------------
 
+STAFF_ROLES = frozenset({
+    UserRole.ADMIN,
+    UserRole.LOGISTICS_MANAGER,
+    UserRole.DRIVER
+})
+
 def require_staff(current_user: User = Depends(get_current_user)):
-    if current_user.role not in [
-        UserRole.ADMIN,
-        UserRole.LOGISTICS_MANAGER,
-        UserRole.DRIVER
-    ]:
+    if current_user.role not in STAFF_ROLES:
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
 
+def require_staff_token(role: UserRole = Depends(get_token_role)):
+    """Same check from the token alone, for calculators that need no user row"""
+    if role not in STAFF_ROLES:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return role
+
+
 # ----------------------------------------
 # Track Driver (Main Endpoint)
 # ----------------------------------------
 
 @router.post("/update")
-def update_tracking(
+async def update_tracking(
     driver_id: UUID,
     shipment_id: UUID,
-    latitude: float,
-    longitude: float,
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
     speed_kph: Optional[float] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return track_driver(
+    return await track_driver(
         db,
         driver_id,
         shipment_id,
@@ -69,14 +78,14 @@ def update_tracking(
 # ----------------------------------------
 
 @router.get("/shipment/{shipment_id}/total-distance")
-def total_distance(
+async def total_distance(
     shipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
     return {
         "shipment_id": shipment_id,
-        "total_distance_meters": calculate_total_distance_traveled(db, shipment_id)
+        "total_distance_meters": await calculate_total_distance_traveled(db, shipment_id)
     }
 
 
@@ -85,16 +94,16 @@ def total_distance(
 # ----------------------------------------
 
 @router.get("/shipment/{shipment_id}/remaining-distance")
-def remaining_distance(
+async def remaining_distance(
     shipment_id: UUID,
     latitude: float,
     longitude: float,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
     return {
         "shipment_id": shipment_id,
-        "remaining_distance_meters": calculate_remaining_distance(
+        "remaining_distance_meters": await calculate_remaining_distance(
             db,
             shipment_id,
             latitude,
@@ -108,10 +117,10 @@ def remaining_distance(
 # ----------------------------------------
 
 @router.get("/eta")
-def eta(
+async def eta(
     remaining_distance_meters: float,
     speed_kph: float,
-    current_user: User = Depends(require_staff)
+    current_role: UserRole = Depends(require_staff_token)
 ):
     minutes = calculate_eta(remaining_distance_meters, speed_kph)
 
@@ -127,15 +136,15 @@ def eta(
 # ----------------------------------------
 
 @router.get("/nearest-drivers")
-def nearest_drivers(
+async def nearest_drivers(
     latitude: float,
     longitude: float,
     radius_meters: float = Query(5000, ge=100),
     limit: int = Query(5, ge=1, le=20),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    drivers = find_nearest_drivers(
+    drivers = await find_nearest_drivers(
         db,
         latitude,
         longitude,
@@ -157,12 +166,12 @@ def nearest_drivers(
 # ----------------------------------------
 
 @router.get("/shipment/{shipment_id}/average-speed")
-def average_speed(
+async def average_speed(
     shipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return calculate_average_speed(shipment_id, db)
+    return await calculate_average_speed(shipment_id, db)
 
 
 # ----------------------------------------
@@ -170,13 +179,13 @@ def average_speed(
 # ----------------------------------------
 
 @router.get("/shipment/{shipment_id}/stops")
-def stops(
+async def stops(
     shipment_id: UUID,
     min_stop_minutes: int = Query(5, ge=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return detect_delivery_stops(
+    return await detect_delivery_stops(
         shipment_id,
         db,
         min_stop_minutes
@@ -188,13 +197,13 @@ def stops(
 # ----------------------------------------
 
 @router.get("/estimate-delivery-time")
-def estimate_delivery_time(
+async def estimate_delivery_time(
     current_lat: float,
     current_lng: float,
     destination_lat: float,
     destination_lng: float,
     speed_kmh: Optional[float] = None,
-    current_user: User = Depends(require_staff)
+    current_role: UserRole = Depends(require_staff_token)
 ):
     return calculate_estimated_delivery_time(
         current_lat,
@@ -210,12 +219,12 @@ def estimate_delivery_time(
 # ----------------------------------------
 
 @router.get("/shipment/{shipment_id}/summary")
-def tracking_summary(
+async def tracking_summary(
     shipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return get_shipment_tracking_summary(shipment_id, db)
+    return await get_shipment_tracking_summary(shipment_id, db)
 
 
 # ----------------------------------------
@@ -223,9 +232,9 @@ def tracking_summary(
 # ----------------------------------------
 
 @router.get("/shipment/{shipment_id}/validate")
-def validate_sequence(
+async def validate_sequence(
     shipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return validate_tracking_point_sequence(shipment_id, db)
+    return await validate_tracking_point_sequence(shipment_id, db)
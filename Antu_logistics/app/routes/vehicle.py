@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from decimal import Decimal
 from typing import Optional
 
-from app.database import get_db
+from app.database import get_async_db
 from app.core.deps import get_current_user
 from app.models.user_model import User, UserRole
 from app.models.vehicle_model import VehicleType
@@ -28,11 +28,13 @@ router = APIRouter(
 # Role Protection
 # ----------------------------------------
 
+STAFF_ROLES = frozenset({
+    UserRole.ADMIN,
+    UserRole.LOGISTICS_MANAGER,
+})
+
 def require_staff(current_user: User = Depends(get_current_user)):
-    if current_user.role not in [
-        UserRole.ADMIN,
-        UserRole.LOGISTICS_MANAGER,
-    ]:
+    if current_user.role not in STAFF_ROLES:
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
@@ -42,12 +44,12 @@ def require_staff(current_user: User = Depends(get_current_user)):
 # ----------------------------------------
 
 @router.get("/{vehicle_id}/utilization")
-def vehicle_utilization(
+async def vehicle_utilization(
     vehicle_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    rate = get_vehicle_utilization_rate(vehicle_id, db)
+    rate = await get_vehicle_utilization_rate(vehicle_id, db)
 
     return {
         "vehicle_id": vehicle_id,
@@ -60,15 +62,16 @@ def vehicle_utilization(
 # ----------------------------------------
 
 @router.get("/recommend")
-def recommend_vehicle(
+async def recommend_vehicle(
     weight_kg: Decimal,
     distance_km: Decimal,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    vehicle = get_optimal_vehicle_for_shipment(
-        weight_kg,
-        distance_km,
+    # Ranking only needs float precision; Decimal stays on the wire
+    vehicle = await get_optimal_vehicle_for_shipment(
+        float(weight_kg),
+        float(distance_km),
         db
     )
 
@@ -88,12 +91,12 @@ def recommend_vehicle(
 # ----------------------------------------
 
 @router.get("/{vehicle_id}/maintenance")
-def maintenance_score(
+async def maintenance_score(
     vehicle_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return calculate_vehicle_maintenance_score(vehicle_id, db)
+    return await calculate_vehicle_maintenance_score(vehicle_id, db)
 
 
 # ----------------------------------------
@@ -101,12 +104,12 @@ def maintenance_score(
 # ----------------------------------------
 
 @router.get("/{vehicle_id}/cost-efficiency")
-def cost_efficiency(
+async def cost_efficiency(
     vehicle_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return get_vehicle_cost_efficiency(vehicle_id, db)
+    return await get_vehicle_cost_efficiency(vehicle_id, db)
 
 
 # ----------------------------------------
@@ -114,12 +117,12 @@ def cost_efficiency(
 # ----------------------------------------
 
 @router.get("/{vehicle_id}/availability")
-def availability(
+async def availability(
     vehicle_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_staff)
 ):
-    return check_vehicle_availability(vehicle_id, db)
+    return await check_vehicle_availability(vehicle_id, db)
 
 
 # ----------------------------------------
@@ -127,7 +130,7 @@ def availability(
 # ----------------------------------------
 
 @router.get("/characteristics/{vehicle_type}")
-def characteristics(
+async def characteristics(
     vehicle_type: VehicleType,
     current_user: User = Depends(require_staff)
 ):
@@ -0,0 +1,9 @@
+from typing import Annotated
+
+from pydantic import Field
+
+# Coordinate types shared by the schemas. strict=True takes JSON numbers as
+# they are instead of also trying to coerce strings, and the bounds are
+# checked inside pydantic-core
+Latitude = Annotated[float, Field(strict=True, ge=-90, le=90)]
+Longitude = Annotated[float, Field(strict=True, ge=-180, le=180)]
@@ -3,20 +3,21 @@ from decimal import Decimal
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.models.shipment_model import ShipmentStatus
 from app.schemas.tracking import TrackingPointRead
+from app.schemas._geo import Latitude, Longitude
 
 
 class ShipmentBase(BaseModel):
     tracking_number: str
     shipper_id: UUID
     driver_id: Optional[UUID] = None
-    origin_latitude: float = Field(..., ge=-90, le=90, description="Origin latitude")
-    origin_longitude: float = Field(..., ge=-180, le=180, description="Origin longitude")
-    destination_latitude: float = Field(..., ge=-90, le=90, description="Destination latitude")
-    destination_longitude: float = Field(..., ge=-180, le=180, description="Destination longitude")
+    origin_latitude: Latitude = Field(..., description="Origin latitude")
+    origin_longitude: Longitude = Field(..., description="Origin longitude")
+    destination_latitude: Latitude = Field(..., description="Destination latitude")
+    destination_longitude: Longitude = Field(..., description="Destination longitude")
     package_description: Optional[str] = None
     weight_kg: Decimal = Field(..., gt=0)
     volume_m3: Optional[Decimal] = None
@@ -54,3 +55,14 @@ class ShipmentRead(ShipmentBase):
     actual_cost: Optional[Decimal] = None
 
     model_config = {"from_attributes": True}
+
+
+# Built once so endpoints validate and dump shipments, nested tracking
+# points included, in a single pydantic-core call
+shipment_adapter = TypeAdapter(ShipmentRead)
+shipment_list_adapter = TypeAdapter(List[ShipmentRead])
+
+
+class ShipmentPage(BaseModel):
+    items: List[ShipmentRead]
+    next_cursor: Optional[str] = None
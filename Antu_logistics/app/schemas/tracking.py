@@ -4,11 +4,13 @@ from uuid import UUID
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.schemas._geo import Latitude, Longitude
+
 
 class TrackingPointBase(BaseModel):
     shipment_id: UUID
-    latitude: float = Field(..., ge=-90, le=90, description="Latitude of the location")
-    longitude: float = Field(..., ge=-180, le=180, description="Longitude of the location")
+    latitude: Latitude = Field(..., description="Latitude of the location")
+    longitude: Longitude = Field(..., description="Longitude of the location")
     speed_kmh: Optional[float] = None
     recorded_at: Optional[datetime] = None
     notes: Optional[str] = None
@@ -16,13 +18,13 @@ class TrackingPointBase(BaseModel):
 
 class TrackingPointCreate(TrackingPointBase):
     shipment_id: UUID
-    latitude: float = Field(..., ge=-90, le=90, description="Latitude of the location")
-    longitude: float = Field(..., ge=-180, le=180, description="Longitude of the location")
+    latitude: Latitude = Field(..., description="Latitude of the location")
+    longitude: Longitude = Field(..., description="Longitude of the location")
 
 
 class TrackingPointRead(TrackingPointBase):
     id: UUID
     shipment_id: UUID
-    time: datetime
+    time: datetime = Field(validation_alias="recorded_at")
 
     model_config = {"from_attributes": True}
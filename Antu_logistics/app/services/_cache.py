@@ -0,0 +1,60 @@
+import functools
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+
+# Caches grouped by namespace so writers can drop everything a change affects
+_namespaces: Dict[str, List[TTLCache]] = defaultdict(list)
+
+def async_ttl_cache(
+    namespace: str,
+    ttl: float = 60,
+    maxsize: int = 128,
+    key: Optional[Callable] = None,
+    version: Optional[Callable[..., Awaitable]] = None
+):
+    """
+    Cache the results of an async function in a process-local TTL cache
+    
+    cachetools' own decorators would cache the coroutine object rather than
+    its result, hence this wrapper.
+    
+    Args:
+        namespace: Group name used by clear_cache
+        ttl: Seconds an entry stays valid
+        maxsize: Maximum number of entries
+        key: Builds the cache key from the call arguments; defaults to all of them
+        version: Async callable taking the same arguments whose result is
+            added to the key, so entries go stale as soon as the data changes
+    
+    Returns:
+        Decorator for an async function
+    """
+    def decorator(func):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        _namespaces[namespace].append(cache)
+        make_key = key or hashkey
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            k = make_key(*args, **kwargs)
+            if version is not None:
+                k = (k, await version(*args, **kwargs))
+            try:
+                return cache[k]
+            except KeyError:
+                pass
+            result = await func(*args, **kwargs)
+            cache[k] = result
+            return result
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+def clear_cache(namespace: str) -> None:
+    """Drop every cached entry in a namespace"""
+    for cache in _namespaces.get(namespace, []):
+        cache.clear()
@@ -1,13 +1,51 @@
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import UUID, func, and_
+from datetime import datetime, time, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import UUID, func, and_, select, cast, extract, true, DateTime, Integer, Numeric
+from sqlalchemy.sql import table, column
+from geoalchemy2 import Geometry
 from app.models.shipment_model import Shipment, ShipmentStatus
 from app.models.driver_model import Driver, DriverStatus
 from app.models.vehicle_model import Vehicle, VehicleStatus
 from app.models.user_model import User, UserRole
+from app.services._cache import async_ttl_cache
 
-def calculate_revenue_forecast(db: Session, days_ahead: int = 30) -> dict:
+# Pickup hotspot clustering (ST_ClusterDBSCAN on lon/lat degrees)
+HOTSPOT_EPS_DEGREES = 0.1
+HOTSPOT_MIN_POINTS = 5
+
+# Dashboards poll these; a minute of staleness is fine
+ANALYTICS_CACHE_TTL = 60
+ANALYTICS_CACHE = "analytics"
+
+# The customer base changes slowly; recount it every few minutes. Kept out of
+# ANALYTICS_CACHE so shipment writes don't throw it away
+CUSTOMER_COUNT_CACHE_TTL = 300
+CUSTOMER_COUNT_CACHE = "customer_count"
+
+# "00:00" .. "23:00", indexed by hour of day
+HOUR_LABELS = tuple(f"{hour:02d}:00" for hour in range(24))
+
+# Money stays Decimal end to end; FastAPI renders it as a JSON number
+CENTS = Decimal("0.01")
+
+# Per-day, per-status shipment totals, refreshed on a schedule (migration 0004)
+daily_shipment_stats = table(
+    "mv_daily_shipment_stats",
+    column("day", DateTime),
+    column("status", Shipment.__table__.c.status.type),
+    column("shipments", Integer),
+    column("actual_cost", Numeric),
+    column("revenue", Numeric),
+)
+
+def _money(amount) -> Decimal:
+    """Round a monetary amount to whole cents"""
+    return Decimal(amount).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, key=lambda db, days_ahead=30: (days_ahead,))
+async def calculate_revenue_forecast(db: AsyncSession, days_ahead: int = 30) -> dict:
     """
     Forecast revenue for the next period based on historical data
     
@@ -18,15 +56,28 @@ def calculate_revenue_forecast(db: Session, days_ahead: int = 30) -> dict:
     Returns:
         Dictionary with forecast data
     """
-    # Get historical data from last 30 days
-    past_30_days = datetime.utcnow() - timedelta(days=30)
-    
-    historical_shipments = db.query(Shipment).filter(
-        Shipment.created_at >= past_30_days,
-        Shipment.status == ShipmentStatus.DELIVERED
-    ).all()
+    # Get historical data from the last 30 whole days; today's bucket is
+    # still filling, so it is left out of the average and both halves
+    today_start = datetime.combine(datetime.utcnow().date(), time.min)
+    past_30_days = today_start - timedelta(days=30)
+    midpoint = past_30_days + timedelta(days=15)
+    stats = daily_shipment_stats.c
+    
+    shipment_count, total_revenue, first_half_revenue, second_half_revenue = (await db.execute(
+        select(
+            func.coalesce(func.sum(stats.shipments), 0),
+            func.coalesce(func.sum(stats.revenue), 0),
+            func.coalesce(func.sum(stats.revenue).filter(stats.day < midpoint), 0),
+            func.coalesce(func.sum(stats.revenue).filter(stats.day >= midpoint), 0)
+        ).where(
+            stats.day >= past_30_days,
+            stats.day < today_start,
+            stats.status == ShipmentStatus.DELIVERED
+        )
+    )).one()
+    shipment_count = int(shipment_count)
     
-    if not historical_shipments:
+    if not shipment_count:
         return {
             "forecast_days": days_ahead,
             "forecasted_revenue": 0,
@@ -35,39 +86,33 @@ def calculate_revenue_forecast(db: Session, days_ahead: int = 30) -> dict:
         }
     
     # Calculate average daily revenue
-    total_revenue = sum([s.actual_cost or s.estimated_cost or 0 for s in historical_shipments])
     avg_daily_revenue = total_revenue / 30
     
     # Calculate growth trend
-    first_15_days = [s for s in historical_shipments if s.created_at < past_30_days + timedelta(days=15)]
-    last_15_days = [s for s in historical_shipments if s.created_at >= past_30_days + timedelta(days=15)]
-    
-    first_half_revenue = sum([s.actual_cost or s.estimated_cost or 0 for s in first_15_days])
-    second_half_revenue = sum([s.actual_cost or s.estimated_cost or 0 for s in last_15_days])
-    
     growth_rate = ((second_half_revenue - first_half_revenue) / first_half_revenue) if first_half_revenue > 0 else 0
     
     # Apply growth rate to forecast
     forecasted_revenue = avg_daily_revenue * days_ahead * (1 + growth_rate)
     
     # Determine confidence
-    if len(historical_shipments) > 50:
+    if shipment_count > 50:
         confidence = "high"
-    elif len(historical_shipments) > 20:
+    elif shipment_count > 20:
         confidence = "medium"
     else:
         confidence = "low"
     
     return {
         "forecast_days": days_ahead,
-        "forecasted_revenue": round(forecasted_revenue, 2),
-        "avg_daily_revenue": round(avg_daily_revenue, 2),
+        "forecasted_revenue": _money(forecasted_revenue),
+        "avg_daily_revenue": _money(avg_daily_revenue),
         "growth_rate_percent": round(growth_rate * 100, 2),
         "confidence": confidence,
-        "based_on_shipments": len(historical_shipments)
+        "based_on_shipments": shipment_count
     }
 
-def analyze_peak_hours(db: Session) -> dict:
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, key=lambda db: ())
+async def analyze_peak_hours(db: AsyncSession) -> dict:
     """
     Analyze peak hours for shipment creation and delivery
     
@@ -77,40 +122,44 @@ def analyze_peak_hours(db: Session) -> dict:
     Returns:
         Dictionary with peak hour analysis
     """
-    # Get all shipments
-    shipments = db.query(Shipment).all()
+    # Count shipments by hour of day (rows come back in hour order)
+    creation_hour = extract("hour", Shipment.created_at)
+    creation_hours = {
+        int(hour): count
+        for hour, count in (await db.execute(
+            select(creation_hour, func.count()).group_by(creation_hour).order_by(creation_hour)
+        )).all()
+    }
     
-    if not shipments:
+    if not creation_hours:
         return {"message": "No data available"}
     
-    # Count shipments by hour of day
-    creation_hours = {}
-    delivery_hours = {}
-    
-    for shipment in shipments:
-        # Creation hour
-        hour = shipment.created_at.hour
-        creation_hours[hour] = creation_hours.get(hour, 0) + 1
-        
-        # Delivery hour
-        if shipment.delivered_at:
-            delivery_hour = shipment.delivered_at.hour
-            delivery_hours[delivery_hour] = delivery_hours.get(delivery_hour, 0) + 1
+    delivery_hour = extract("hour", Shipment.delivered_at)
+    delivery_hours = {
+        int(hour): count
+        for hour, count in (await db.execute(
+            select(delivery_hour, func.count())
+            .where(Shipment.delivered_at.isnot(None))
+            .group_by(delivery_hour)
+            .order_by(delivery_hour)
+        )).all()
+    }
     
     # Find peak hours
     peak_creation_hour = max(creation_hours, key=creation_hours.get) if creation_hours else 0
     peak_delivery_hour = max(delivery_hours, key=delivery_hours.get) if delivery_hours else 0
     
     return {
-        "peak_creation_hour": f"{peak_creation_hour:02d}:00",
+        "peak_creation_hour": HOUR_LABELS[peak_creation_hour],
         "peak_creation_count": creation_hours.get(peak_creation_hour, 0),
-        "peak_delivery_hour": f"{peak_delivery_hour:02d}:00",
+        "peak_delivery_hour": HOUR_LABELS[peak_delivery_hour],
         "peak_delivery_count": delivery_hours.get(peak_delivery_hour, 0),
-        "hourly_creation_distribution": {f"{k:02d}:00": v for k, v in sorted(creation_hours.items())},
-        "hourly_delivery_distribution": {f"{k:02d}:00": v for k, v in sorted(delivery_hours.items())}
+        "hourly_creation_distribution": {HOUR_LABELS[hour]: count for hour, count in creation_hours.items()},
+        "hourly_delivery_distribution": {HOUR_LABELS[hour]: count for hour, count in delivery_hours.items()}
     }
 
-def calculate_customer_lifetime_value(shipper_id: UUID, db: Session) -> dict:
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, maxsize=1024, key=lambda shipper_id, db: (shipper_id,))
+async def calculate_customer_lifetime_value(shipper_id: UUID, db: AsyncSession) -> dict:
     """
     Calculate the lifetime value of a customer
     
@@ -121,14 +170,23 @@ def calculate_customer_lifetime_value(shipper_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with CLV metrics
     """
-    customer = db.query(User).filter(User.id == shipper_id).first()
+    customer = (await db.execute(
+        select(User.full_name, User.role).where(User.id == shipper_id)
+    )).one_or_none()
     if not customer or customer.role != UserRole.CUSTOMER:
         return {"error": "Shipper not found"}
     
-    # Get all shipments
-    shipments = db.query(Shipment).filter(Shipment.shipper_id== shipper_id).all()
-    
-    if not shipments:
+    # Aggregate shipment history
+    total_shipments, total_spent, first_order, last_order = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(Shipment.effective_cost), 0),
+            func.min(Shipment.created_at),
+            func.max(Shipment.created_at)
+        ).where(Shipment.shipper_id == shipper_id)
+    )).one()
+    
+    if not total_shipments:
         return {
             "customer_id": shipper_id,
             "lifetime_value": 0,
@@ -137,14 +195,10 @@ def calculate_customer_lifetime_value(shipper_id: UUID, db: Session) -> dict:
         }
     
     # Calculate metrics
-    total_spent = sum([s.actual_cost or s.estimated_cost or 0 for s in shipments])
-    total_shipments = len(shipments)
     avg_order_value = total_spent / total_shipments
     
     # Calculate frequency (days between orders)
     if total_shipments > 1:
-        first_order = min([s.created_at for s in shipments])
-        last_order = max([s.created_at for s in shipments])
         days_active = (last_order - first_order).days
         order_frequency_days = days_active / (total_shipments - 1) if total_shipments > 1 else 0
     else:
@@ -154,7 +208,7 @@ def calculate_customer_lifetime_value(shipper_id: UUID, db: Session) -> dict:
     # Predict future value (simple model)
     # Assume customer will continue for another year
     if order_frequency_days > 0:
-        estimated_future_orders = 365 / order_frequency_days
+        estimated_future_orders = Decimal(365 / order_frequency_days)
         predicted_ltv = total_spent + (estimated_future_orders * avg_order_value)
     else:
         predicted_ltv = total_spent
@@ -172,17 +226,18 @@ def calculate_customer_lifetime_value(shipper_id: UUID, db: Session) -> dict:
     return {
         "customer_id": shipper_id,
         "customer_name": customer.full_name,
-        "lifetime_value": round(total_spent, 2),
-        "predicted_ltv_next_year": round(predicted_ltv, 2),
+        "lifetime_value": _money(total_spent),
+        "predicted_ltv_next_year": _money(predicted_ltv),
         "total_shipments": total_shipments,
-        "average_order_value": round(avg_order_value, 2),
+        "average_order_value": _money(avg_order_value),
         "order_frequency_days": round(order_frequency_days, 1),
-        "customer_since": shipments[0].created_at.date().isoformat() if shipments else None,
+        "customer_since": first_order.date().isoformat() if first_order else None,
         "days_active": days_active,
         "customer_segment": segment
     }
 
-def analyze_delivery_performance(db: Session) -> dict:
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, key=lambda db: ())
+async def analyze_delivery_performance(db: AsyncSession) -> dict:
     """
     Analyze overall delivery performance metrics
     
@@ -192,33 +247,27 @@ def analyze_delivery_performance(db: Session) -> dict:
     Returns:
         Dictionary with performance analysis
     """
-    # Get all delivered shipments
-    delivered_shipments = db.query(Shipment).filter(
-        Shipment.status == ShipmentStatus.DELIVERED,
-        Shipment.picked_up_at.isnot(None),
-        Shipment.delivered_at.isnot(None)
-    ).all()
-    
-    if not delivered_shipments:
-        return {"message": "No delivery data available"}
-    
-    delivery_times = []
-    
-    for shipment in delivered_shipments:
-        if shipment.picked_up_at and shipment.delivered_at:
-            delivery_time = (shipment.delivered_at - shipment.picked_up_at).total_seconds() / 3600  # hours
-            delivery_times.append(delivery_time)
-    
-    if not delivery_times:
-        return {"message": "No valid delivery time data"}
+    delivery_time = extract("epoch", Shipment.delivered_at - Shipment.picked_up_at) / 3600  # hours
+    
+    # Aggregate all delivered shipments (on-time target is 24 hours)
+    total_deliveries, avg_delivery_time, min_delivery_time, max_delivery_time, on_time_deliveries = (await db.execute(
+        select(
+            func.count(),
+            func.avg(delivery_time),
+            func.min(delivery_time),
+            func.max(delivery_time),
+            func.count().filter(delivery_time <= 24)
+        ).where(
+            Shipment.status == ShipmentStatus.DELIVERED,
+            Shipment.picked_up_at.isnot(None),
+            Shipment.delivered_at.isnot(None)
+        )
+    )).one()
     
-    avg_delivery_time = sum(delivery_times) / len(delivery_times)
-    min_delivery_time = min(delivery_times)
-    max_delivery_time = max(delivery_times)
+    if not total_deliveries:
+        return {"message": "No delivery data available"}
     
-    # Calculate on-time delivery rate (assuming 24 hours is target)
-    on_time_deliveries = sum(1 for t in delivery_times if t <= 24)
-    on_time_rate = (on_time_deliveries / len(delivery_times)) * 100
+    on_time_rate = (on_time_deliveries / total_deliveries) * 100
     
     # Performance rating
     if on_time_rate >= 90:
@@ -231,16 +280,17 @@ def analyze_delivery_performance(db: Session) -> dict:
         rating = "needs_improvement"
     
     return {
-        "total_deliveries": len(delivered_shipments),
-        "average_delivery_time_hours": round(avg_delivery_time, 2),
-        "fastest_delivery_hours": round(min_delivery_time, 2),
-        "slowest_delivery_hours": round(max_delivery_time, 2),
+        "total_deliveries": total_deliveries,
+        "average_delivery_time_hours": round(float(avg_delivery_time), 2),
+        "fastest_delivery_hours": round(float(min_delivery_time), 2),
+        "slowest_delivery_hours": round(float(max_delivery_time), 2),
         "on_time_deliveries": on_time_deliveries,
         "on_time_rate_percent": round(on_time_rate, 2),
         "performance_rating": rating
     }
 
-def get_geographic_insights(db: Session) -> dict:
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, key=lambda db: ())
+async def get_geographic_insights(db: AsyncSession) -> dict:
     """
     Analyze geographic patterns in deliveries
     
@@ -250,28 +300,43 @@ def get_geographic_insights(db: Session) -> dict:
     Returns:
         Dictionary with geographic insights
     """
-    from collections import defaultdict
-    
-    shipments = db.query(Shipment).filter(
-        Shipment.status == ShipmentStatus.DELIVERED
-    ).all()
+    distance = func.coalesce(Shipment.estimated_distance_km, 0)
     
-    if not shipments:
+    # Categorize by distance
+    total_deliveries, total_distance, short_range, medium_range, long_range = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(distance), 0),
+            func.count().filter(distance < 5),
+            func.count().filter(distance >= 5, distance < 20),
+            func.count().filter(distance >= 20)
+        ).where(Shipment.status == ShipmentStatus.DELIVERED)
+    )).one()
+    
+    if not total_deliveries:
         return {"message": "No delivery data available"}
     
-    # This is simplified - in production you'd use geocoding to get actual areas
-    # For now, we'll analyze based on coordinates
-    
-    total_distance = sum([s.estimated_distance_km or 0 for s in shipments])
-    avg_distance = total_distance / len(shipments)
-    
-    # Categorize by distance
-    short_range = sum(1 for s in shipments if (s.estimated_distance_km or 0) < 5)
-    medium_range = sum(1 for s in shipments if 5 <= (s.estimated_distance_km or 0) < 20)
-    long_range = sum(1 for s in shipments if (s.estimated_distance_km or 0) >= 20)
+    avg_distance = total_distance / total_deliveries
+    
+    # Cluster pickup points server-side; noise points get a NULL cluster id
+    clustered = select(
+        func.ST_ClusterDBSCAN(
+            cast(Shipment.origin, Geometry(srid=4326)), HOTSPOT_EPS_DEGREES, HOTSPOT_MIN_POINTS
+        ).over().label("cluster_id"),
+        cast(Shipment.origin, Geometry(srid=4326)).label("geom")
+    ).where(Shipment.status == ShipmentStatus.DELIVERED).subquery()
+    
+    center = func.ST_Centroid(func.ST_Collect(clustered.c.geom))
+    hotspots = (await db.execute(
+        select(func.count(), func.ST_Y(center), func.ST_X(center))
+        .where(clustered.c.cluster_id.isnot(None))
+        .group_by(clustered.c.cluster_id)
+        .order_by(func.count().desc())
+        .limit(5)
+    )).all()
     
     return {
-        "total_deliveries": len(shipments),
+        "total_deliveries": total_deliveries,
         "total_distance_covered_km": round(total_distance, 2),
         "average_delivery_distance_km": round(avg_distance, 2),
         "distance_distribution": {
@@ -280,13 +345,22 @@ def get_geographic_insights(db: Session) -> dict:
             "long_range_20plus_km": long_range
         },
         "distribution_percentages": {
-            "short_range_percent": round(short_range / len(shipments) * 100, 2),
-            "medium_range_percent": round(medium_range / len(shipments) * 100, 2),
-            "long_range_percent": round(long_range / len(shipments) * 100, 2)
-        }
+            "short_range_percent": round(short_range / total_deliveries * 100, 2),
+            "medium_range_percent": round(medium_range / total_deliveries * 100, 2),
+            "long_range_percent": round(long_range / total_deliveries * 100, 2)
+        },
+        "pickup_hotspots": [
+            {
+                "shipments": count,
+                "center_latitude": round(lat, 6),
+                "center_longitude": round(lng, 6)
+            }
+            for count, lat, lng in hotspots
+        ]
     }
 
-def calculate_fleet_efficiency(db: Session) -> dict:
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, key=lambda db: ())
+async def calculate_fleet_efficiency(db: AsyncSession) -> dict:
     """
     Calculate overall fleet efficiency metrics
     
@@ -296,32 +370,40 @@ def calculate_fleet_efficiency(db: Session) -> dict:
     Returns:
         Dictionary with fleet efficiency metrics
     """
-    total_vehicles = db.query(Vehicle).filter(Vehicle.is_active == True).count()
-    available_vehicles = db.query(Vehicle).filter(
-        Vehicle.is_active == True,
-        Vehicle.status == VehicleStatus.AVAILABLE
-    ).count()
-    
-    total_drivers = db.query(Driver).filter(Driver.is_active == True).count()
-    active_drivers = db.query(Driver).filter(
-        Driver.is_active == True,
-        Driver.status.in_([DriverStatus.AVAILABLE, DriverStatus.ON_DUTY])
-    ).count()
+    vehicles = select(
+        func.count().label("total"),
+        func.count().filter(Vehicle.status == VehicleStatus.AVAILABLE).label("available"),
+        func.coalesce(func.sum(Vehicle.capacity_kg), 0).label("capacity")
+    ).where(Vehicle.is_active == True).subquery()
+    
+    drivers = select(
+        func.count().label("total"),
+        func.count().filter(Driver.status.in_([DriverStatus.AVAILABLE, DriverStatus.ON_DUTY])).label("active")
+    ).where(Driver.is_active == True).subquery()
+    
+    active = select(func.count()).select_from(Shipment).where(
+        Shipment.status.in_([ShipmentStatus.ASSIGNED, ShipmentStatus.IN_TRANSIT])
+    ).scalar_subquery()
+    
+    # Vehicle, driver and shipment counts in one round trip (each side is a single row)
+    (
+        total_vehicles, available_vehicles, total_capacity,
+        total_drivers, active_drivers, active_shipments
+    ) = (await db.execute(
+        select(
+            vehicles.c.total,
+            vehicles.c.available,
+            vehicles.c.capacity,
+            drivers.c.total,
+            drivers.c.active,
+            active
+        ).select_from(vehicles.join(drivers, true()))
+    )).one()
     
     # Calculate utilization rates
     vehicle_utilization = ((total_vehicles - available_vehicles) / total_vehicles * 100) if total_vehicles > 0 else 0
     driver_utilization = (active_drivers / total_drivers * 100) if total_drivers > 0 else 0
     
-    # Get active shipments
-    active_shipments = db.query(Shipment).filter(
-        Shipment.status.in_([ShipmentStatus.ASSIGNED, ShipmentStatus.IN_TRANSIT])
-    ).count()
-    
-    # Calculate capacity
-    total_capacity = db.query(func.sum(Vehicle.capacity_kg)).filter(
-        Vehicle.is_active == True
-    ).scalar() or 0
-    
     # Efficiency rating
     overall_efficiency = (vehicle_utilization + driver_utilization) / 2
     
@@ -348,7 +430,8 @@ def calculate_fleet_efficiency(db: Session) -> dict:
         "shipments_per_driver": round(active_shipments / active_drivers, 2) if active_drivers > 0 else 0
     }
 
-def generate_executive_summary(db: Session) -> dict:
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, key=lambda db: ())
+async def generate_executive_summary(db: AsyncSession) -> dict:
     """
     Generate a comprehensive executive summary
     
@@ -360,53 +443,44 @@ def generate_executive_summary(db: Session) -> dict:
     """
     # Get current date info
     today = datetime.utcnow().date()
-    this_month_start = today.replace(day=1)
+    this_month_start = datetime.combine(today.replace(day=1), time.min)
     last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
     
-    # This month's metrics
-    this_month_shipments = db.query(Shipment).filter(
-        Shipment.created_at >= datetime.combine(this_month_start, datetime.min.time())
-    ).count()
-    
-    this_month_revenue = db.query(func.sum(Shipment.actual_cost)).filter(
-        Shipment.created_at >= datetime.combine(this_month_start, datetime.min.time()),
-        Shipment.status == ShipmentStatus.DELIVERED
-    ).scalar() or 0
-    
-    # Last month's metrics for comparison
-    last_month_shipments = db.query(Shipment).filter(
-        and_(
-            Shipment.created_at >= datetime.combine(last_month_start, datetime.min.time()),
-            Shipment.created_at < datetime.combine(this_month_start, datetime.min.time())
-        )
-    ).count()
-    
-    last_month_revenue = db.query(func.sum(Shipment.actual_cost)).filter(
-        and_(
-            Shipment.created_at >= datetime.combine(last_month_start, datetime.min.time()),
-            Shipment.created_at < datetime.combine(this_month_start, datetime.min.time())
-        ),
-        Shipment.status == ShipmentStatus.DELIVERED
-    ).scalar() or 0
+    stats = daily_shipment_stats.c
+    this_month = stats.day >= this_month_start
+    last_month = and_(stats.day >= last_month_start, stats.day < this_month_start)
+    delivered = stats.status == ShipmentStatus.DELIVERED
+    
+    # This month's metrics, and last month's for comparison
+    this_month_shipments, this_month_revenue, last_month_shipments, last_month_revenue = (await db.execute(
+        select(
+            func.coalesce(func.sum(stats.shipments).filter(this_month), 0),
+            func.coalesce(func.sum(stats.actual_cost).filter(this_month, delivered), 0),
+            func.coalesce(func.sum(stats.shipments).filter(last_month), 0),
+            func.coalesce(func.sum(stats.actual_cost).filter(last_month, delivered), 0)
+        ).where(stats.day >= last_month_start)
+    )).one()
+    this_month_shipments = int(this_month_shipments)
+    last_month_shipments = int(last_month_shipments)
     
     # Calculate growth
     shipment_growth = ((this_month_shipments - last_month_shipments) / last_month_shipments * 100) if last_month_shipments > 0 else 0
     revenue_growth = ((this_month_revenue - last_month_revenue) / last_month_revenue * 100) if last_month_revenue > 0 else 0
     
     # Get other metrics
-    delivery_performance = analyze_delivery_performance(db)
-    fleet_efficiency = calculate_fleet_efficiency(db)
+    delivery_performance = await analyze_delivery_performance(db)
+    fleet_efficiency = await calculate_fleet_efficiency(db)
     
     return {
         "report_date": today.isoformat(),
         "period": "monthly",
         "this_month": {
             "shipments": this_month_shipments,
-            "revenue": round(float(this_month_revenue), 2)
+            "revenue": _money(this_month_revenue)
         },
         "last_month": {
             "shipments": last_month_shipments,
-            "revenue": round(float(last_month_revenue), 2)
+            "revenue": _money(last_month_revenue)
         },
         "growth": {
             "shipments_percent": round(shipment_growth, 2),
@@ -422,7 +496,23 @@ def generate_executive_summary(db: Session) -> dict:
         }
     }
 
-def identify_business_opportunities(db: Session) -> List[dict]:
+@async_ttl_cache(CUSTOMER_COUNT_CACHE, ttl=CUSTOMER_COUNT_CACHE_TTL, maxsize=1, key=lambda db: ())
+async def count_customers(db: AsyncSession) -> int:
+    """
+    Count users registered as customers
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        Number of customer accounts
+    """
+    return await db.scalar(
+        select(func.count()).select_from(User).where(User.role == UserRole.CUSTOMER)
+    )
+
+@async_ttl_cache(ANALYTICS_CACHE, ttl=ANALYTICS_CACHE_TTL, key=lambda db: ())
+async def identify_business_opportunities(db: AsyncSession) -> List[dict]:
     """
     Identify business growth opportunities based on data
     
@@ -435,7 +525,7 @@ def identify_business_opportunities(db: Session) -> List[dict]:
     opportunities = []
     
     # Check underutilized fleet
-    fleet_efficiency = calculate_fleet_efficiency(db)
+    fleet_efficiency = await calculate_fleet_efficiency(db)
     if fleet_efficiency.get("vehicle_utilization_percent", 100) < 50:
         opportunities.append({
             "type": "underutilized_fleet",
@@ -445,12 +535,16 @@ def identify_business_opportunities(db: Session) -> List[dict]:
         })
     
     # Check for repeat customers
-    customers_with_multiple_orders = db.query(
-        Shipment.customer_id,
-        func.count(Shipment.id)
-    ).group_by(Shipment.customer_id).having(func.count(Shipment.id) > 5).count()
-    
-    total_customers = db.query(User).filter(User.role == UserRole.CUSTOMER).count()
+    repeat_shippers = (
+        select(Shipment.shipper_id)
+        .group_by(Shipment.shipper_id)
+        .having(func.count() > 5)
+        .subquery()
+    )
+    customers_with_multiple_orders = await db.scalar(
+        select(func.count()).select_from(repeat_shippers)
+    )
+    total_customers = await count_customers(db)
     
     repeat_rate = (customers_with_multiple_orders / total_customers * 100) if total_customers > 0 else 0
     
@@ -463,7 +557,7 @@ def identify_business_opportunities(db: Session) -> List[dict]:
         })
     
     # Check geographic coverage
-    geo_insights = get_geographic_insights(db)
+    geo_insights = await get_geographic_insights(db)
     if geo_insights.get("distribution_percentages", {}).get("long_range_percent", 0) < 20:
         opportunities.append({
             "type": "expand_coverage",
@@ -1,15 +1,38 @@
 from typing import Optional, List, Tuple
-from geoalchemy2 import WKTElement
+import threading
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from decimal import Decimal
-from shapely import Point
-from geoalchemy2.shape import from_shape
-from sqlalchemy import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import UUID, and_, func, literal, or_, select, Integer, Numeric
+from sqlalchemy.sql import table, column
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta
 from app.models.driver_model import Driver, DriverStatus
+from app.models.vehicle_model import Vehicle
 from app.models.shipment_model import Shipment, ShipmentStatus
 from app.models.user_model import User
-from app.services.shipments_service import calculate_distance_km
+from app.services.shipments_service import calculate_distance_km, geography_point
+
+# A driver with this many assigned / in-transit shipments takes no more
+MAX_ACTIVE_SHIPMENTS = 5
+ACTIVE_SHIPMENT_STATUSES = (ShipmentStatus.ASSIGNED, ShipmentStatus.IN_TRANSIT)
+
+# Workload only moves when a shipment is assigned, reassigned or changes
+# status; those writes drop the driver's entry via invalidate_driver_workload
+_workload_cache = TTLCache(maxsize=2048, ttl=10)
+_workload_lock = threading.Lock()
+
+# Per-driver shipment totals, kept current by a trigger on shipments (migration 0009)
+driver_efficiency_stats = table(
+    "driver_stats",
+    column("driver_id", Shipment.__table__.c.driver_id.type),
+    column("total", Integer),
+    column("delivered", Integer),
+    column("cancelled", Integer),
+    column("distance_km", Numeric),
+)
 
 def calculate_driver_efficiency_score(driver_id: UUID, db: Session) -> dict:
     """
@@ -23,12 +46,16 @@ def calculate_driver_efficiency_score(driver_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with efficiency metrics and score
     """
-    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    driver = db.get(Driver, driver_id)
     if not driver:
         return {"score": 0, "status": "unknown"}
     
-    # Get all shipments
-    total_shipments = db.query(Shipment).filter(Shipment.driver_id == driver.id).count()
+    # Precomputed totals; drivers without shipments have no row
+    stats = driver_efficiency_stats.c
+    totals = db.query(
+        stats.total, stats.delivered, stats.cancelled, stats.distance_km
+    ).filter(stats.driver_id == driver_id).one_or_none()
+    total_shipments, completed, cancelled, distance_covered = totals or (0, 0, 0, 0)
     
     if total_shipments == 0:
         return {
@@ -38,26 +65,8 @@ def calculate_driver_efficiency_score(driver_id: UUID, db: Session) -> dict:
         }
     
     # Calculate completion rate
-    completed = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.status == ShipmentStatus.DELIVERED
-    ).count()
-    
-    cancelled = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.status == ShipmentStatus.CANCELLED
-    ).count()
-    
     completion_rate = (completed / total_shipments) * 100 if total_shipments > 0 else 0
     
-    # Calculate distance efficiency
-    total_distance = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.status == ShipmentStatus.DELIVERED
-    ).with_entities(Shipment.estimated_distance_km).all()
-    
-    distance_covered = sum([d[0] or 0 for d in total_distance])
-    
     # Efficiency score calculation (0-100)
     # 60% weight on completion rate, 40% on total deliveries
     efficiency_score = (completion_rate * 0.7) + min(40, (completed / 10) * 40)
@@ -91,6 +100,7 @@ def calculate_driver_efficiency_score(driver_id: UUID, db: Session) -> dict:
         "average_distance_per_delivery": round(distance_covered / completed, 2) if completed > 0 else 0
     }
 
+@cached(_workload_cache, key=lambda driver_id, db: hashkey(driver_id), lock=_workload_lock)
 def get_driver_active_workload(driver_id: UUID, db: Session) -> dict:
     """
     Get current workload of a driver
@@ -102,25 +112,23 @@ def get_driver_active_workload(driver_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with current workload information
     """
-    assigned = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.status == ShipmentStatus.ASSIGNED
-    ).count()
-    
-    in_transit = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.status == ShipmentStatus.IN_TRANSIT
-    ).count()
+    # Active shipment counts and pending distance, per status
+    by_status = {
+        status: (count, distance)
+        for status, count, distance in db.query(
+            Shipment.status,
+            func.count(),
+            func.coalesce(func.sum(Shipment.estimated_distance_km), 0)
+        ).filter(
+            Shipment.driver_id == driver_id,
+            Shipment.status.in_(ACTIVE_SHIPMENT_STATUSES)
+        ).group_by(Shipment.status).all()
+    }
     
+    assigned = by_status.get(ShipmentStatus.ASSIGNED, (0, 0))[0]
+    in_transit = by_status.get(ShipmentStatus.IN_TRANSIT, (0, 0))[0]
     total_active = assigned + in_transit
-    
-    # Get pending distance
-    active_shipments = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.status.in_([ShipmentStatus.ASSIGNED, ShipmentStatus.IN_TRANSIT])
-    ).all()
-    
-    pending_distance = sum([s.estimated_distance_km or 0 for s in active_shipments])
+    pending_distance = sum(distance for _, distance in by_status.values())
     
     # Determine workload status
     if total_active == 0:
@@ -138,19 +146,25 @@ def get_driver_active_workload(driver_id: UUID, db: Session) -> dict:
         "total_active": total_active,
         "pending_distance_km": round(pending_distance, 2),
         "workload_status": workload_status,
-        "can_accept_more": total_active < 5  # Max 5 active shipments
+        "can_accept_more": total_active < MAX_ACTIVE_SHIPMENTS
     }
 
+def invalidate_driver_workload(*driver_ids: Optional[UUID]) -> None:
+    """Drop cached workloads for drivers whose shipments just changed"""
+    with _workload_lock:
+        for driver_id in driver_ids:
+            if driver_id is not None:
+                _workload_cache.pop(hashkey(driver_id), None)
+
 def update_driver_location(db: Session, driver_id, current_latitude: float, current_longitude: float):
-    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    driver = db.get(Driver, driver_id)
 
     if not driver:
         raise Exception("Driver not found")
 
     try:
-        # Create PostGIS geography point
-        point = from_shape(Point(current_longitude, current_latitude), srid=4326)
-        driver.location = point
+        # PostGIS builds the geography point from the two floats
+        driver.location = geography_point(current_latitude, current_longitude)
 
         db.commit()
         db.refresh(driver)
@@ -182,15 +196,12 @@ def calculate_estimated_arrival_time(
     Returns:
         Dictionary with ETA information or None
     """
-    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    driver = db.get(Driver, driver_id)
     if not driver or not driver.is_active:
         return None
     
     # Calculate distance from current location to destination
-    distance = calculate_distance_km(
-        origin= WKTElement(f"POINT({current_lng} {current_lat})", srid=4326),
-        destination= WKTElement(f"POINT({destination_lng} {destination_lat})", srid=4326)
-    )
+    distance = calculate_distance_km(current_lat, current_lng, destination_lat, destination_lng)
     
     # Assume average speed of 40 km/h in urban areas
     average_speed_kmh = 40
@@ -198,7 +209,7 @@ def calculate_estimated_arrival_time(
     time_minutes = time_hours * 60
     
     # Calculate ETA
-    eta = datetime.utcnow() + timedelta(minutes=time_minutes)
+    eta = datetime.utcnow() + timedelta(minutes=float(time_minutes))
     
     return {
         "current_location": {
@@ -231,9 +242,12 @@ def check_driver_availability_for_shipment(
     Returns:
         Dictionary with availability status and reason
     """
-    from app.models.vehicle_model import Vehicle
-    
-    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    # Vehicle comes back in the same query for the capacity check; its own
+    # selectin-loaded driver list isn't needed here
+    driver = db.get(
+        Driver, driver_id,
+        options=[joinedload(Driver.vehicle).lazyload(Vehicle.drivers)]
+    )
     if not driver:
         return {
             "available": False,
@@ -262,7 +276,7 @@ def check_driver_availability_for_shipment(
     
     # Check vehicle capacity if assigned
     if driver.vehicle_id:
-        vehicle = db.query(Vehicle).filter(Vehicle.id == driver.vehicle_id).first()
+        vehicle = driver.vehicle
         if vehicle and vehicle.capacity_kg < shipment_weight_kg:
             return {
                 "available": False,
@@ -296,28 +310,18 @@ def get_driver_daily_summary(driver_id: UUID, date: datetime, db: Session) -> di
     start_of_day = date.replace(hour=0, minute=0, second=0, microsecond=0)
     end_of_day = start_of_day + timedelta(days=1)
     
-    # Shipments picked up today
-    picked_up = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.picked_up_at >= start_of_day,
-        Shipment.picked_up_at < end_of_day
-    ).count()
-    
-    # Shipments delivered today
-    delivered = db.query(Shipment).filter(
-        Shipment.driver_id == driver_id,
-        Shipment.delivered_at >= start_of_day,
-        Shipment.delivered_at < end_of_day
-    ).count()
+    picked_up_today = and_(Shipment.picked_up_at >= start_of_day, Shipment.picked_up_at < end_of_day)
+    delivered_today = and_(Shipment.delivered_at >= start_of_day, Shipment.delivered_at < end_of_day)
     
-    # Distance covered today
-    today_shipments = db.query(Shipment).filter(
+    # Pickups, deliveries and distance delivered today in one pass
+    picked_up, delivered, distance_today = db.query(
+        func.count().filter(picked_up_today),
+        func.count().filter(delivered_today),
+        func.coalesce(func.sum(Shipment.estimated_distance_km).filter(delivered_today), 0)
+    ).filter(
         Shipment.driver_id == driver_id,
-        Shipment.delivered_at >= start_of_day,
-        Shipment.delivered_at < end_of_day
-    ).all()
-    
-    distance_today = sum([s.estimated_distance_km or 0 for s in today_shipments])
+        or_(picked_up_today, delivered_today)
+    ).one()
     
     return {
         "date": start_of_day.date().isoformat(),
@@ -327,16 +331,19 @@ def get_driver_daily_summary(driver_id: UUID, date: datetime, db: Session) -> di
         "deliveries_per_hour": round(delivered / 8, 2) if delivered > 0 else 0  # Assuming 8-hour workday
     }
 
-def find_nearest_available_driver(
+async def find_nearest_available_driver(
     origin_lat: float,
     origin_lng: float,
     shipment_weight_kg: Decimal,
-    db: Session,
+    db: AsyncSession,
     max_distance_km: Decimal = 50
-) -> Optional[Tuple[Driver, float]]:
+) -> Optional[Tuple[Row, float]]:
     """
     Find the nearest available driver to a pickup location
     
+    Async because dispatch calls it on every assignment; it returns one
+    small row, so it runs on asyncpg without tying up a worker thread.
+    
     Args:
         origin_lat: Pickup latitude
         origin_lng: Pickup longitude
@@ -345,45 +352,45 @@ def find_nearest_available_driver(
         max_distance_km: Maximum search radius
     
     Returns:
-        Tuple of (Driver, distance) or None
+        Tuple of (driver row with id and status, distance) or None
     """
-    # Get all available drivers with location data
-    drivers = db.query(Driver).filter(
-        Driver.is_active == True,
-        Driver.status.in_([DriverStatus.AVAILABLE, DriverStatus.ON_DUTY]),
-        Driver.location.isnot(None),
-    ).all()
-    
-    nearest_driver = None
-    nearest_distance = float('inf')
-    
-    for driver in drivers:
-        # Check if driver can handle the shipment
-        availability = check_driver_availability_for_shipment(
-            driver.id,
-            shipment_weight_kg,
-            db
-        )
-        
-        if not availability["available"]:
-            continue
-        
-        # Calculate distance to pickup point
-        distance = calculate_distance_km(
-            driver.location.y if driver.location else 0,
-            driver.location.x if driver.location else 0,
-            origin_lat,
-            origin_lng
-        )
-        
-        if distance < nearest_distance and distance <= max_distance_km:
-            nearest_distance = distance
-            nearest_driver = driver
-    
-    if nearest_driver:
-        return (nearest_driver, nearest_distance)
-    
-    return None
+    pickup = geography_point(origin_lat, origin_lng)
+    
+    # Same rules as check_driver_availability_for_shipment, evaluated in SQL.
+    # Only "has MAX_ACTIVE_SHIPMENTS or more" matters here, so probe for that
+    # row instead of counting them all
+    at_capacity = select(literal(1)).where(
+        Shipment.driver_id == Driver.id,
+        Shipment.status.in_(ACTIVE_SHIPMENT_STATUSES)
+    ).offset(MAX_ACTIVE_SHIPMENTS - 1).limit(1).correlate(Driver).exists()
+    
+    # Nearest suitable driver within range: ST_DWithin and <-> both use the
+    # GiST index on drivers.location, so far-away drivers are never visited.
+    # The inner join on Vehicle is deliberate: a driver with no vehicle is
+    # rejected ("Driver has no vehicle assigned"), and one with a vehicle
+    # must have the capacity for the shipment
+    result = (await db.execute(
+        select(
+            Driver.id,
+            Driver.status,
+            func.ST_Distance(Driver.location, pickup).label("distance_m")
+        ).join(
+            Vehicle, Vehicle.id == Driver.vehicle_id
+        ).where(
+            Driver.is_active == True,
+            Driver.status.in_([DriverStatus.AVAILABLE, DriverStatus.ON_DUTY]),
+            func.ST_DWithin(Driver.location, pickup, float(max_distance_km) * 1000),
+            Vehicle.capacity_kg >= shipment_weight_kg,
+            ~at_capacity,
+        ).order_by(
+            Driver.location.distance_centroid(pickup)
+        ).limit(1)
+    )).first()
+    
+    if not result:
+        return None
+    
+    return (result, result.distance_m / 1000)
 
 def get_driver_performance_trends(driver_id: UUID, days: int, db: Session) -> dict:
     """
@@ -399,13 +406,22 @@ def get_driver_performance_trends(driver_id: UUID, days: int, db: Session) -> di
     """
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    # Get shipments in period
-    shipments = db.query(Shipment).filter(
+    # Split into first half and second half to detect trend
+    mid_point = start_date + timedelta(days=days/2)
+    delivered = Shipment.status == ShipmentStatus.DELIVERED
+    
+    # Count shipments in period, delivered ones overall and per half
+    total_shipments, total_delivered, first_half, second_half = db.query(
+        func.count(),
+        func.count().filter(delivered),
+        func.count().filter(delivered, Shipment.created_at < mid_point),
+        func.count().filter(delivered, Shipment.created_at >= mid_point)
+    ).filter(
         Shipment.driver_id == driver_id,
         Shipment.created_at >= start_date
-    ).all()
+    ).one()
     
-    if not shipments:
+    if not total_shipments:
         return {
             "period_days": days,
             "total_shipments": 0,
@@ -413,15 +429,10 @@ def get_driver_performance_trends(driver_id: UUID, days: int, db: Session) -> di
         }
     
     # Calculate daily averages
-    daily_deliveries = len([s for s in shipments if s.status == ShipmentStatus.DELIVERED]) / days
-    
-    # Split into first half and second half to detect trend
-    mid_point = start_date + timedelta(days=days/2)
-    first_half = [s for s in shipments if s.created_at < mid_point and s.status == ShipmentStatus.DELIVERED]
-    second_half = [s for s in shipments if s.created_at >= mid_point and s.status == ShipmentStatus.DELIVERED]
+    daily_deliveries = total_delivered / days
     
-    first_half_avg = len(first_half) / (days/2)
-    second_half_avg = len(second_half) / (days/2)
+    first_half_avg = first_half / (days/2)
+    second_half_avg = second_half / (days/2)
     
     # Determine trend
     if second_half_avg > first_half_avg * 1.1:
@@ -433,8 +444,8 @@ def get_driver_performance_trends(driver_id: UUID, days: int, db: Session) -> di
     
     return {
         "period_days": days,
-        "total_shipments": len(shipments),
-        "delivered": len([s for s in shipments if s.status == ShipmentStatus.DELIVERED]),
+        "total_shipments": total_shipments,
+        "delivered": total_delivered,
         "daily_average": round(daily_deliveries, 2),
         "first_half_average": round(first_half_avg, 2),
         "second_half_average": round(second_half_avg, 2),
@@ -1,27 +1,50 @@
 from geoalchemy2 import Geography
-from geoalchemy2.elements import WKTElement
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import cast, func
 from sqlalchemy.exc import SQLAlchemyError
-import random
+import base64
+import secrets
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
+from uuid import UUID
 import string
 from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_000
+
+# Pricing (KSH), kept as Decimal so costs never pass through float
+BASE_FARE = Decimal("200")
+TIER_1_KM, TIER_2_KM = Decimal("10"), Decimal("50")
+TIER_1_RATE, TIER_2_RATE, TIER_3_RATE = Decimal("50"), Decimal("40"), Decimal("30")
+FREE_WEIGHT_KG = Decimal("20")
+WEIGHT_SURCHARGE_PER_10KG = Decimal("20")
+VEHICLE_MULTIPLIERS = {
+    "motorcycle": Decimal("1.0"),
+    "van": Decimal("1.3"),
+    "truck": Decimal("1.5"),
+    "pickup": Decimal("1.2"),
+}
+ZERO = Decimal("0")
+
+TRACKING_ALPHABET = string.ascii_uppercase + string.digits
+TRACKING_SUFFIX_LENGTH = 8
 
 def generate_tracking_number() -> str:
     """
     Generate a unique tracking number
-    Format: ANTU-YYYYMMDD-XXXXX
-    Example: ANTU-20250210-A7K9M
+    Format: ANTU-YYYYMMDD-XXXXXXXX
+    Example: ANTU-20250210-A7K9M2QX
+    
+    The suffix comes from the OS CSPRNG, so numbers can't be guessed from
+    one another (the tracking endpoint is public), and 36^8 codes per day
+    keep collisions negligible without a lookup or retry.
     """
     date_part = datetime.now().strftime("%Y%m%d")
-    random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
+    random_part = ''.join(secrets.choice(TRACKING_ALPHABET) for _ in range(TRACKING_SUFFIX_LENGTH))
     return f"ANTU-{date_part}-{random_part}"
 
 
 def calculate_distance_km(
-    db: Session,
     origin_lat: float,
     origin_lng: float,
     dest_lat: float,
@@ -30,19 +53,13 @@ def calculate_distance_km(
     """
     Returns distance in kilometers between two coordinates
     without creating a shipment.
-    """
-
-    origin = WKTElement(f"POINT({origin_lng} {origin_lat})", srid=4326)
-    destination = WKTElement(f"POINT({dest_lng} {dest_lat})", srid=4326)
-
-    distance_meters = db.query(
-             func.ST_Distance(origin, destination)
-             ).scalar()
     
-    if distance_meters is None:
-        raise ValueError("Distance calculation failed")
+    Both ends are known coordinates, so this is computed in-process
+    rather than with a PostGIS round trip.
+    """
+    distance_meters = haversine_distances_m(origin_lat, origin_lng, dest_lat, dest_lng)
     
-    distance_km = Decimal(distance_meters) / Decimal("1000")
+    distance_km = Decimal(float(distance_meters)) / Decimal("1000")
     estimated_distance_km = distance_km.quantize(
         Decimal("0.01"),
         rounding=ROUND_HALF_UP
@@ -50,6 +67,51 @@ def calculate_distance_km(
     return estimated_distance_km
 
 
+def geography_point(latitude: float, longitude: float):
+    """
+    SQL expression for a WGS84 geography point built from bound floats
+    
+    Unlike an EWKT string this needs no text formatting here and no WKT
+    parsing in PostGIS, and the statement text is identical for every
+    location, so its compiled form is reused.
+    
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+    
+    Returns:
+        geography(Point, 4326) expression
+    """
+    return cast(
+        func.ST_SetSRID(func.ST_MakePoint(float(longitude), float(latitude)), 4326),
+        Geography(srid=4326)
+    )
+
+
+def haversine_distances_m(origin_lats, origin_lngs, dest_lats, dest_lngs) -> np.ndarray:
+    """
+    Great-circle distances between many origin/destination pairs at once
+    
+    Works element-wise on equal-length arrays (or scalars), so a whole batch
+    costs one vectorized pass and no database round trip.
+    
+    Args:
+        origin_lats: Origin latitudes in degrees
+        origin_lngs: Origin longitudes in degrees
+        dest_lats: Destination latitudes in degrees
+        dest_lngs: Destination longitudes in degrees
+    
+    Returns:
+        Array of distances in meters
+    """
+    phi1 = np.radians(origin_lats)
+    phi2 = np.radians(dest_lats)
+    d_phi = phi2 - phi1
+    d_lam = np.radians(np.subtract(dest_lngs, origin_lngs))
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lam / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
 def calculate_delivery_cost(
     estimated_distance_km: Decimal,
     weight_kg: Decimal,
@@ -78,39 +140,24 @@ def calculate_delivery_cost(
     Returns:
         Total cost in KSH (rounded to nearest whole number)
     """
-    # Base fare
-    base_fare = 200
-    
-    # Distance-based cost
-    if estimated_distance_km <= 10:
-        distance_cost = estimated_distance_km * 50
-    elif estimated_distance_km <= 50:
-        distance_cost = (10 * 50) + ((estimated_distance_km - 10) * 40)
-    else:
-        distance_cost = (10 * 50) + (40 * 40) + ((estimated_distance_km - 50) * 30)
+    distance = Decimal(estimated_distance_km)
+    weight = Decimal(weight_kg)
+    
+    # Distance-based cost: each tier charges only the kilometres inside it
+    distance_cost = (
+        TIER_1_RATE * min(distance, TIER_1_KM)
+        + TIER_2_RATE * max(ZERO, min(distance, TIER_2_KM) - TIER_1_KM)
+        + TIER_3_RATE * max(ZERO, distance - TIER_2_KM)
+    )
     
     # Weight surcharge (for packages over 20kg)
-    weight_surcharge = 0
-    if weight_kg > 20:
-        excess_weight = weight_kg - 20
-        weight_surcharge = (excess_weight / 10) * 20
-    
-    # Calculate subtotal
-    subtotal = base_fare + distance_cost + weight_surcharge
+    weight_surcharge = max(ZERO, weight - FREE_WEIGHT_KG) / 10 * WEIGHT_SURCHARGE_PER_10KG
     
     # Apply vehicle type multiplier
-    vehicle_multipliers = {
-        "motorcycle": 1.0,
-        "van": 1.3,
-        "truck": 1.5,
-        "pickup": 1.2
-    }
-    
-    if vehicle_type:
-        multiplier = vehicle_multipliers.get(vehicle_type.lower(), 1.0)
-        subtotal *= multiplier
+    multiplier = VEHICLE_MULTIPLIERS.get(vehicle_type.lower(), 1) if vehicle_type else 1
+    subtotal = (BASE_FARE + distance_cost + weight_surcharge) * multiplier
     
-    return round(subtotal, 0)
+    return subtotal.quantize(Decimal("1"), rounding=ROUND_HALF_UP)
 
 def estimate_delivery_time(estimated_distance_km: Decimal) -> int:
     """
@@ -142,23 +189,48 @@ def validate_coordinates(latitude: float, longitude: float) -> bool:
     Validate that coordinates are within valid ranges
     
     Args:
-        latitude: Latitude as string
-        longitude: Longitude as string
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
     
     Returns:
         True if valid, False otherwise
     """
+    # Valid latitude: -90 to 90
+    # Valid longitude: -180 to 180
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
+
+def encode_shipment_cursor(created_at: datetime, shipment_id: UUID) -> str:
+    """
+    Encode the position of a shipment in the newest-first listing
+    
+    Args:
+        created_at: Creation time of the last shipment on the page
+        shipment_id: ID of the last shipment on the page
+    
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()},{shipment_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_shipment_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_shipment_cursor
+    
+    Args:
+        cursor: Cursor string from a previous page
+    
+    Returns:
+        Tuple of (created_at, shipment_id)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
     try:
-        lat = float(latitude)
-        lng = float(longitude)
-        
-        # Valid latitude: -90 to 90
-        # Valid longitude: -180 to 180
-        if -90 <= lat <= 90 and -180 <= lng <= 180:
-            return True
-        return False
-    except (ValueError, TypeError):
-        return False
+        created_at, shipment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(",")
+        return datetime.fromisoformat(created_at), UUID(shipment_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -166,7 +238,7 @@ if __name__ == "__main__":
     print("Tracking Number:", generate_tracking_number())
     
     # Test distance calculation (Nairobi CBD to JKIA)
-    estimated_distance_km = calculate_distance_km("-1.286389", "36.817223", "-1.319167", "36.927778")
+    estimated_distance_km = calculate_distance_km(-1.286389, 36.817223, -1.319167, 36.927778)
     print(f"Distance: {estimated_distance_km} km")
     
     # Test cost calculation
@@ -1,19 +1,66 @@
 from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from geoalchemy2.elements import WKTElement
+import asyncio
+import logging
+import math
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from geoalchemy2 import Geography, Geometry
 from sqlalchemy import UUID
-from shapely import Point
 from app.models.tracking_model import TrackingPoint
 from app.models.shipment_model import Shipment
-from app.services.shipments_service import calculate_distance_km
-from sqlalchemy import func
-from shapely.geometry import Point
-from geoalchemy2.shape import from_shape
+from app.services.shipments_service import geography_point, haversine_distances_m
+from sqlalchemy import Float, bindparam, cast, extract, func, insert, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from app.models.driver_model import Driver
+from app.schemas.tracking import TrackingPointCreate
+from app.services._cache import async_ttl_cache
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Pings closer than this to the last stored one for the same driver and
+# shipment are not written; a stationary driver is still re-recorded once
+# the entry expires
+MIN_TRACKING_SPACING_M = 10
+_last_tracked = TTLCache(maxsize=10_000, ttl=3600)
+
+# Per-shipment results are keyed by the newest ping, so a poll that finds
+# no new tracking points is served from memory; the shipment routes clear it
+# when status or driver change
+TRACKING_CACHE = "tracking"
+TRACKING_CACHE_TTL = 60
+
+async def _last_recorded_at(shipment_id: UUID, db: AsyncSession) -> Optional[datetime]:
+    return await db.scalar(
+        select(func.max(TrackingPoint.recorded_at)).where(
+            TrackingPoint.shipment_id == shipment_id
+        )
+    )
 
-def save_tracking_point(
-    db: Session,
+def _shipment_cache(service):
+    """Cache a (shipment_id, db) service until the shipment gets a new ping"""
+    return async_ttl_cache(
+        TRACKING_CACHE,
+        ttl=TRACKING_CACHE_TTL,
+        maxsize=10_000,
+        key=lambda shipment_id, db: (shipment_id,),
+        version=_last_recorded_at
+    )(service)
+
+def _within_spacing(
+    latitude: float,
+    longitude: float,
+    last_latitude: float,
+    last_longitude: float
+) -> bool:
+    """Equirectangular check that two nearby points are under MIN_TRACKING_SPACING_M apart"""
+    dx = (longitude - last_longitude) * math.cos(math.radians(latitude)) * 111_320
+    dy = (latitude - last_latitude) * 110_540
+    return dx * dx + dy * dy < MIN_TRACKING_SPACING_M ** 2
+
+async def save_tracking_point(
+    db: AsyncSession,
     driver_id: UUID,
     shipment_id: UUID,
     latitude: float,
@@ -21,69 +68,167 @@ def save_tracking_point(
     speed_kph: float | None = None
 ):
     try:
-        point = from_shape(Point(longitude, latitude), srid=4326)
-
         tracking = TrackingPoint(
-            driver_id=driver_id,
             shipment_id=shipment_id,
-            location=point,
-            speed_kph=speed_kph
+            location=geography_point(latitude, longitude),
+            speed_kmh=speed_kph
         )
 
         db.add(tracking)
-        db.commit()
-        db.refresh(tracking)
+        await db.commit()
+        await db.refresh(tracking)
 
         return tracking
 
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise Exception("Error saving tracking point")
 
-def update_driver_current_location(
-    db: Session,
+# PostGIS builds each point from the two bound floats of its row
+_BATCH_LOCATION = cast(
+    func.ST_SetSRID(
+        func.ST_MakePoint(bindparam("lng", type_=Float), bindparam("lat", type_=Float)),
+        4326
+    ),
+    Geography(srid=4326)
+)
+
+async def save_tracking_points_batch(
+    db: AsyncSession,
+    points: List[TrackingPointCreate]
+) -> int:
+    """
+    Insert many GPS pings in a single executemany round trip
+    
+    Args:
+        db: Database session
+        points: Pings to store, in any order
+    
+    Returns:
+        Number of tracking points inserted
+    """
+    if not points:
+        return 0
+    
+    now = datetime.utcnow()
+    rows = [
+        {
+            "shipment_id": p.shipment_id,
+            "lat": p.latitude,
+            "lng": p.longitude,
+            "speed_kmh": p.speed_kmh,
+            "recorded_at": p.recorded_at or now,
+            "notes": p.notes
+        }
+        for p in points
+    ]
+    
+    try:
+        await db.execute(insert(TrackingPoint).values(location=_BATCH_LOCATION), rows)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise Exception("Error saving tracking points")
+    
+    return len(rows)
+
+# Live pings from /tracking/update are queued and written in batches, one
+# INSERT and one commit per flush instead of per ping
+TRACKING_QUEUE_SIZE = 10_000
+TRACKING_FLUSH_INTERVAL = 0.2
+TRACKING_FLUSH_MAX_ROWS = 500
+_pending_points: asyncio.Queue = asyncio.Queue(maxsize=TRACKING_QUEUE_SIZE)
+
+async def flush_pending_tracking_points() -> int:
+    """
+    Write everything currently queued, in batches of TRACKING_FLUSH_MAX_ROWS
+    
+    Returns:
+        Number of tracking points written
+    """
+    written = 0
+    while not _pending_points.empty():
+        batch = []
+        while len(batch) < TRACKING_FLUSH_MAX_ROWS and not _pending_points.empty():
+            batch.append(_pending_points.get_nowait())
+        written += await _write_tracking_batch(batch)
+    return written
+
+async def _write_tracking_batch(batch: List[TrackingPointCreate]) -> int:
+    """
+    Write one batch; if it fails, retry its halves so a bad row only loses itself
+    
+    Returns:
+        Number of tracking points written
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            return await save_tracking_points_batch(db, batch)
+    except Exception:
+        if len(batch) == 1:
+            logger.exception("Dropped tracking point for shipment %s", batch[0].shipment_id)
+            return 0
+    
+    middle = len(batch) // 2
+    return await _write_tracking_batch(batch[:middle]) + await _write_tracking_batch(batch[middle:])
+
+async def run_tracking_flusher():
+    """Background task: wait for a ping, let more arrive, then flush them together"""
+    while True:
+        # Put the first ping back so the flush below picks it up too
+        _pending_points.put_nowait(await _pending_points.get())
+        await asyncio.sleep(TRACKING_FLUSH_INTERVAL)
+        await flush_pending_tracking_points()
+
+async def update_driver_current_location(
+    db: AsyncSession,
     driver_id: UUID,
     latitude: float,
     longitude: float
 ):
-    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    driver = await db.get(Driver, driver_id)
 
     if not driver:
         raise Exception("Driver not found")
 
     try:
-        point = from_shape(Point(longitude, latitude), srid=4326)
-        driver.location = point
+        driver.location = geography_point(latitude, longitude)
 
-        db.commit()
-        db.refresh(driver)
+        await db.commit()
+        await db.refresh(driver)
 
         return driver
 
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise Exception("Error updating driver location")
 
-def calculate_route_deviation(
-    db: Session,
+# Shipments store no planned path, so deviation is measured from the
+# straight origin -> destination line (Shipment.route)
+ROUTE_DEVIATION_THRESHOLD_M = 100
+
+def _distance_from_route(shipment_id: UUID, point):
+    """Scalar subquery: meters from point to the shipment's route, NULL if there is no shipment"""
+    return select(
+        func.ST_Distance(Shipment.route, point)
+    ).where(
+        Shipment.id == shipment_id
+    ).scalar_subquery()
+
+async def calculate_route_deviation(
+    db: AsyncSession,
     shipment_id: UUID,
     latitude: float,
     longitude: float,
-    threshold_meters: float = 100
+    threshold_meters: float = ROUTE_DEVIATION_THRESHOLD_M
 ):
-    shipment = db.query(Shipment).filter(
-        Shipment.id == shipment_id
-    ).first()
+    distance = await db.scalar(
+        select(_distance_from_route(shipment_id, geography_point(latitude, longitude)))
+    )
 
-    if not shipment or not shipment.route:
+    if distance is None:
         raise Exception("Shipment route not found")
 
-    point = from_shape(Point(longitude, latitude), srid=4326)
-
-    distance = db.query(
-        func.ST_Distance(shipment.route, point)
-    ).scalar()
-
     distance_m = float(distance)
 
     return {
@@ -91,82 +236,125 @@ def calculate_route_deviation(
         "is_deviated": distance_m > threshold_meters
     }
 
-def track_driver(
-    db: Session,
+async def track_driver(
+    db: AsyncSession,
     driver_id: UUID,
     shipment_id: UUID,
     latitude: float,
     longitude: float,
     speed_kph: float | None = None
 ):
-    tracking = save_tracking_point(
-        db,
-        driver_id,
-        shipment_id,
-        latitude,
-        longitude,
-        speed_kph
-    )
+    key = (driver_id, shipment_id)
+    last = _last_tracked.get(key)
+    if last and _within_spacing(latitude, longitude, last[0], last[1]):
+        return last[2]
+
+    received_at = datetime.utcnow()
+    point = geography_point(latitude, longitude)
+
+    # Move the driver and measure the deviation in one statement and one
+    # commit; no row comes back if the driver does not exist
+    moved = update(Driver).where(
+        Driver.id == driver_id
+    ).values(
+        location=point,
+        last_location_update=received_at
+    ).returning(Driver.id).cte("moved")
 
-    update_driver_current_location(
-        db,
-        driver_id,
-        latitude,
-        longitude
-    )
+    try:
+        row = (await db.execute(
+            select(
+                moved.c.id,
+                _distance_from_route(shipment_id, point).label("distance")
+            )
+        )).first()
 
-    deviation = calculate_route_deviation(
-        db,
-        shipment_id,
-        latitude,
-        longitude
-    )
+        if not row:
+            raise Exception("Driver not found")
+        if row.distance is None:
+            raise Exception("Shipment route not found")
 
-    return {
-        "tracking_id": tracking.id,
-        "distance_from_route_meters": deviation["distance_from_route_meters"],
-        "is_deviated": deviation["is_deviated"]
-    }
+        await db.commit()
 
-def calculate_total_distance_traveled(
-    db: Session,
+    except Exception:
+        await db.rollback()
+        raise
+
+    # Queued only once the driver and shipment are known to exist, so a bad
+    # request never puts a row into another driver's batch. Waits only when
+    # the queue is full, which slows writers to the flush rate
+    await _pending_points.put(TrackingPointCreate(
+        shipment_id=shipment_id,
+        latitude=latitude,
+        longitude=longitude,
+        speed_kmh=speed_kph,
+        recorded_at=received_at
+    ))
+
+    distance_m = float(row.distance)
+
+    response = {
+        "accepted": True,
+        "distance_from_route_meters": round(distance_m, 2),
+        "is_deviated": distance_m > ROUTE_DEVIATION_THRESHOLD_M
+    }
+    _last_tracked[key] = (latitude, longitude, response)
+
+    return response
+
+@async_ttl_cache(
+    TRACKING_CACHE,
+    ttl=TRACKING_CACHE_TTL,
+    maxsize=10_000,
+    key=lambda db, shipment_id: (shipment_id,),
+    version=lambda db, shipment_id: _last_recorded_at(shipment_id, db)
+)
+async def calculate_total_distance_traveled(
+    db: AsyncSession,
     shipment_id: UUID
 ):
-    result = db.query(
-        func.ST_Length(
-            func.ST_MakeLine(
-                TrackingPoint.location
-            )
+    # Build the path in recording order and measure it on the spheroid,
+    # so the result is in meters rather than degrees
+    path = func.ST_MakeLine(
+        aggregate_order_by(
+            cast(TrackingPoint.location, Geometry(srid=4326)),
+            TrackingPoint.recorded_at
         )
-    ).filter(
-        TrackingPoint.shipment_id == shipment_id
-    ).scalar()
+    )
+
+    result = await db.scalar(
+        select(
+            func.ST_Length(cast(path, Geography(srid=4326)))
+        ).where(
+            TrackingPoint.shipment_id == shipment_id
+        )
+    )
 
     return round(float(result or 0), 2)
 
-def calculate_remaining_distance(
-    db: Session,
+async def calculate_remaining_distance(
+    db: AsyncSession,
     shipment_id: UUID,
     latitude: float,
     longitude: float
 ):
-    shipment = db.query(Shipment).filter(
-        Shipment.id == shipment_id
-    ).first()
-
-    if not shipment:
-        raise Exception("Shipment not found")
+    point = geography_point(latitude, longitude)
 
-    point = from_shape(Point(longitude, latitude), srid=4326)
-
-    remaining = db.query(
-        func.ST_Distance(
-            shipment.destination,
-            point
+    remaining = await db.scalar(
+        select(
+            func.ST_Distance(
+                Shipment.destination,
+                point
+            )
+        ).where(
+            Shipment.id == shipment_id
         )
-    ).scalar()
+    )
+
+    if remaining is None:
+        raise Exception("Shipment not found")
 
-    return round(float(remaining or 0), 2)
+    return round(float(remaining), 2)
 
 def calculate_eta(
     remaining_distance_meters: float,
@@ -182,27 +370,63 @@ def calculate_eta(
 
     return round(minutes, 2)
 
-def find_nearest_drivers(
-    db: Session,
+async def find_nearest_drivers(
+    db: AsyncSession,
     latitude: float,
     longitude: float,
     radius_meters: float = 5000,
     limit: int = 5
 ):
-    point = from_shape(Point(longitude, latitude), srid=4326)
-
-    drivers = db.query(
-        Driver.id,
-        func.ST_Distance(Driver.location, point).label("distance")
-    ).filter(
-        func.ST_DWithin(Driver.location, point, radius_meters)
-    ).order_by("distance").limit(limit).all()
+    point = geography_point(latitude, longitude)
+
+    # ST_DWithin and <-> both use the GiST index on drivers.location, so
+    # only the nearest `limit` rows are read and sent back
+    drivers = (await db.execute(
+        select(
+            Driver.id,
+            func.ST_Distance(Driver.location, point).label("distance")
+        ).where(
+            Driver.is_active == True,
+            func.ST_DWithin(Driver.location, point, radius_meters)
+        ).order_by(
+            Driver.location.distance_centroid(point)
+        ).limit(limit)
+    )).all()
 
     return drivers
 
 
 
-def calculate_average_speed(shipment_id: UUID, db: Session) -> dict:
+def _tracking_segments(shipment_id: UUID):
+    """
+    Every tracking point of a shipment paired with the one before it
+    
+    The first point has no predecessor, so its segment columns are NULL.
+    """
+    in_order = dict(order_by=TrackingPoint.recorded_at)
+    return select(
+        TrackingPoint.id,
+        func.lag(TrackingPoint.latitude).over(**in_order).label("latitude"),
+        func.lag(TrackingPoint.longitude).over(**in_order).label("longitude"),
+        func.lag(TrackingPoint.recorded_at).over(**in_order).label("start_time"),
+        func.lag(TrackingPoint.notes).over(**in_order).label("notes"),
+        TrackingPoint.recorded_at.label("end_time"),
+        TrackingPoint.speed_kmh,
+        func.count().over().label("points"),
+        func.ST_Distance(
+            func.lag(TrackingPoint.location).over(**in_order),
+            TrackingPoint.location
+        ).label("meters"),
+        extract(
+            "epoch",
+            TrackingPoint.recorded_at - func.lag(TrackingPoint.recorded_at).over(**in_order)
+        ).label("seconds"),
+    ).where(
+        TrackingPoint.shipment_id == shipment_id
+    ).subquery()
+
+@_shipment_cache
+async def calculate_average_speed(shipment_id: UUID, db: AsyncSession) -> dict:
     """
     Calculate average speed during delivery
     
@@ -213,55 +437,47 @@ def calculate_average_speed(shipment_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with speed metrics
     """
-    tracking_points = db.query(TrackingPoint).filter(
-        TrackingPoint.shipment_id == shipment_id
-    ).order_by(TrackingPoint.recorded_at.asc()).all()
+    segments = _tracking_segments(shipment_id)
+    
+    # Speed over every segment between consecutive points
+    moving = segments.c.seconds > 0
+    speed = segments.c.meters * 3.6 / segments.c.seconds
+    
+    points, moving_segments, average, fastest, slowest, recorded_speeds = (await db.execute(
+        select(
+            func.count(),
+            func.count().filter(moving),
+            func.avg(speed).filter(moving),
+            func.max(speed).filter(moving),
+            func.min(speed).filter(moving),
+            # Also include speeds from tracking points if available
+            func.count().filter(segments.c.speed_kmh != 0)
+        )
+    )).one()
     
-    if len(tracking_points) < 2:
+    if points < 2:
         return {
             "average_speed_kmh": 0,
             "max_speed_kmh": 0,
             "message": "Insufficient tracking data"
         }
     
-    speeds = []
-    
-    for i in range(1, len(tracking_points)):
-        prev_point = tracking_points[i-1]
-        curr_point = tracking_points[i]
-        
-        # Calculate distance between points
-        distance = calculate_distance_km(
-            prev_point.x, prev_point.y,
-            curr_point.x, curr_point.y
-        )
-        
-        # Calculate time difference in hours
-        time_diff = (curr_point.recorded_at - prev_point.recorded_at).total_seconds() / 3600
-        
-        if time_diff > 0:
-            speed = distance / time_diff
-            speeds.append(speed)
-    
-    if not speeds:
+    if not moving_segments:
         return {
             "average_speed_kmh": 0,
             "max_speed_kmh": 0,
             "message": "Could not calculate speed"
         }
     
-    # Also include speeds from tracking points if available
-    recorded_speeds = [p.speed_kmh for p in tracking_points if p.speed_kmh]
-    
     return {
-        "average_speed_kmh": round(sum(speeds) / len(speeds), 2) if speeds else 0,
-        "max_speed_kmh": round(max(speeds), 2) if speeds else 0,
-        "min_speed_kmh": round(min(speeds), 2) if speeds else 0,
-        "calculated_from_points": len(speeds),
-        "recorded_speeds_available": len(recorded_speeds)
+        "average_speed_kmh": round(float(average), 2),
+        "max_speed_kmh": round(float(fastest), 2),
+        "min_speed_kmh": round(float(slowest), 2),
+        "calculated_from_points": moving_segments,
+        "recorded_speeds_available": recorded_speeds
     }
 
-def detect_delivery_stops(shipment_id: UUID, db: Session, min_stop_minutes: int = 5) -> List[dict]:
+async def detect_delivery_stops(shipment_id: UUID, db: AsyncSession, min_stop_minutes: int = 5) -> List[dict]:
     """
     Detect where the driver stopped during delivery
     Useful for identifying delays or multiple pickup/delivery points
@@ -274,42 +490,37 @@ def detect_delivery_stops(shipment_id: UUID, db: Session, min_stop_minutes: int
     Returns:
         List of detected stops with details
     """
-    tracking_points = db.query(TrackingPoint).filter(
-        TrackingPoint.shipment_id == shipment_id
-    ).order_by(TrackingPoint.recorded_at.asc()).all()
-    
-    if len(tracking_points) < 2:
-        return []
-    
-    stops = []
-    
-    for i in range(1, len(tracking_points)):
-        prev_point = tracking_points[i-1]
-        curr_point = tracking_points[i]
-        
-        # Calculate distance moved
-        distance = calculate_distance_km(
-            prev_point.x, prev_point.y,
-            curr_point.x, curr_point.y
-        )
-        
-        # Calculate time difference
-        time_diff_minutes = (curr_point.recorded_at - prev_point.recorded_at).total_seconds() / 60
-        
-        # If little movement over significant time = stop
-        if distance < 0.1 and time_diff_minutes >= min_stop_minutes:  # Less than 100m movement
-            stops.append({
-                "location": {
-                    "latitude": prev_point.x,
-                    "longitude": prev_point.y
-                },
-                "start_time": prev_point.recorded_at.isoformat(),
-                "end_time": curr_point.recorded_at.isoformat(),
-                "duration_minutes": round(time_diff_minutes, 1),
-                "notes": prev_point.notes or "Unspecified stop"
-            })
-    
-    return stops
+    # Pair every point with the one before it; only stops leave the database
+    segments = _tracking_segments(shipment_id)
+    
+    # If little movement over significant time = stop (less than 100m movement)
+    rows = (await db.execute(
+        select(
+            segments.c.latitude,
+            segments.c.longitude,
+            segments.c.start_time,
+            segments.c.end_time,
+            (segments.c.seconds / 60).label("duration_minutes"),
+            segments.c.notes
+        ).where(
+            segments.c.meters < 100,
+            segments.c.seconds >= min_stop_minutes * 60
+        ).order_by(segments.c.start_time)
+    )).all()
+    
+    return [
+        {
+            "location": {
+                "latitude": row.latitude,
+                "longitude": row.longitude
+            },
+            "start_time": row.start_time.isoformat(),
+            "end_time": row.end_time.isoformat(),
+            "duration_minutes": round(float(row.duration_minutes), 1),
+            "notes": row.notes or "Unspecified stop"
+        }
+        for row in rows
+    ]
 
 def calculate_estimated_delivery_time(
     current_location_lat: float,
@@ -318,9 +529,6 @@ def calculate_estimated_delivery_time(
     destination_lng: float,
     current_speed_kmh: Optional[float] = None
 ) -> dict:
-    
-    Driver.location = from_shape(Point(current_location_lng, current_location_lat), srid=4326)
-    Shipment.destination = from_shape(Point(destination_lng, destination_lat), srid=4326)
     """
     Calculate estimated time to reach destination from current location
     
@@ -334,11 +542,13 @@ def calculate_estimated_delivery_time(
     Returns:
         Dictionary with ETA information
     """
-    # Calculate remaining distance
-    remaining_distance = calculate_distance_km(
-        current_location_lat, current_location_lng,
-        destination_lat, destination_lng
-    )
+    # Calculate remaining distance; both ends are known, so no query is needed
+    remaining_distance = float(haversine_distances_m(
+        current_location_lat,
+        current_location_lng,
+        destination_lat,
+        destination_lng
+    )) / 1000
     
     # Use current speed if available, otherwise assume average urban speed
     speed = current_speed_kmh if current_speed_kmh and current_speed_kmh > 0 else 40
@@ -358,7 +568,8 @@ def calculate_estimated_delivery_time(
         "eta_formatted": eta.strftime("%I:%M %p")
     }
 
-def get_shipment_tracking_summary(shipment_id: UUID, db: Session) -> dict:
+@_shipment_cache
+async def get_shipment_tracking_summary(shipment_id: UUID, db: AsyncSession) -> dict:
     """
     Get comprehensive tracking summary for a shipment
     
@@ -369,66 +580,87 @@ def get_shipment_tracking_summary(shipment_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with complete tracking summary
     """
-    shipment = db.query(Shipment).filter(Shipment.id == shipment_id).first()
+    # Coordinates come unpacked by ST_X/ST_Y, so no geometry is decoded here
+    shipment = (await db.execute(
+        select(
+            Shipment.tracking_number,
+            Shipment.status,
+            Shipment.origin_latitude,
+            Shipment.origin_longitude,
+            Shipment.destination_latitude,
+            Shipment.destination_longitude,
+            Shipment.estimated_distance_km
+        ).where(
+            Shipment.id == shipment_id
+        )
+    )).first()
     if not shipment:
         return {"error": "Shipment not found"}
     
-    tracking_points = db.query(TrackingPoint).filter(
-        TrackingPoint.shipment_id == shipment_id
-    ).order_by(TrackingPoint.recorded_at.asc()).all()
+    # Only the newest point and the point count are used, so fetch those as
+    # plain columns rather than hydrating every TrackingPoint
+    latest_point = (await db.execute(
+        select(
+            TrackingPoint.latitude,
+            TrackingPoint.longitude,
+            TrackingPoint.recorded_at,
+            TrackingPoint.speed_kmh,
+            func.count().over().label("points")
+        ).where(
+            TrackingPoint.shipment_id == shipment_id
+        ).order_by(TrackingPoint.recorded_at.desc()).limit(1)
+    )).first()
     
     summary = {
         "shipment_id": shipment_id,
         "tracking_number": shipment.tracking_number,
         "status": shipment.status.value,
         "origin": {
-            "latitude": shipment.origin.x,
-            "longitude": shipment.origin.y,
-            "address": shipment.origin_address
+            "latitude": shipment.origin_latitude,
+            "longitude": shipment.origin_longitude
         },
         "destination": {
-            "latitude": shipment.destination.x,
-            "longitude": shipment.destination.y,
-            "address": shipment.destination_address
+            "latitude": shipment.destination_latitude,
+            "longitude": shipment.destination_longitude
         },
         "estimated_distance_km": shipment.estimated_distance_km,
-        "tracking_points_count": len(tracking_points)
+        "tracking_points_count": latest_point.points if latest_point else 0
     }
     
-    if tracking_points:
+    if latest_point:
         # Latest location
-        latest_point = tracking_points[-1]
         summary["current_location"] = {
-            "latitude": latest_point.x,
-            "longitude": latest_point.y,
+            "latitude": latest_point.latitude,
+            "longitude": latest_point.longitude,
             "timestamp": latest_point.recorded_at.isoformat(),
             "speed_kmh": latest_point.speed_kmh
         }
         
-        # Location accuracy
-        accuracy = update_driver_current_location(latest_point, datetime.utcnow())
-        summary["location_accuracy"] = accuracy
-        
         # Route deviation
-        deviation = calculate_route_deviation(shipment_id, db)
+        deviation = await calculate_route_deviation(
+            db,
+            shipment_id,
+            latest_point.latitude,
+            latest_point.longitude
+        )
         summary["route_deviation"] = deviation
         
         # Average speed
-        speed_info = calculate_average_speed(shipment_id, db)
+        speed_info = await calculate_average_speed(shipment_id, db)
         summary["speed_info"] = speed_info
         
         # Detected stops
-        stops = detect_delivery_stops(shipment_id, db)
+        stops = await detect_delivery_stops(shipment_id, db)
         summary["stops_detected"] = len(stops)
         
         # ETA if still in transit
         from app.models.shipment_model import ShipmentStatus
         if shipment.status in [ShipmentStatus.IN_TRANSIT, ShipmentStatus.ASSIGNED]:
             eta_info = calculate_estimated_delivery_time(
-                latest_point.x,
-                latest_point.y,
-                shipment.destination.x,
-                shipment.destination.y,
+                latest_point.latitude,
+                latest_point.longitude,
+                shipment.destination_latitude,
+                shipment.destination_longitude,
                 latest_point.speed_kmh
             )
             summary["eta"] = eta_info
@@ -437,7 +669,8 @@ def get_shipment_tracking_summary(shipment_id: UUID, db: Session) -> dict:
     
     return summary
 
-def validate_tracking_point_sequence(shipment_id: UUID, db: Session) -> dict:
+@_shipment_cache
+async def validate_tracking_point_sequence(shipment_id: UUID, db: AsyncSession) -> dict:
     """
     Validate that tracking points are in logical sequence
     Detects anomalies like impossible speeds or backward movement
@@ -449,11 +682,28 @@ def validate_tracking_point_sequence(shipment_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with validation results
     """
-    tracking_points = db.query(TrackingPoint).filter(
-        TrackingPoint.shipment_id == shipment_id
-    ).order_by(TrackingPoint.recorded_at.asc()).all()
-    
-    if len(tracking_points) < 2:
+    segments = _tracking_segments(shipment_id)
+    
+    # Check time sequence, and for impossible speeds (>150 km/h in urban delivery)
+    not_sequential = segments.c.seconds <= 0
+    speed = segments.c.meters * 3.6 / func.nullif(segments.c.seconds, 0)
+    
+    # Only anomalies leave the database, plus the first point (which has no
+    # segment) to carry the point count
+    rows = (await db.execute(
+        select(
+            segments.c.id,
+            not_sequential.label("not_sequential"),
+            speed.label("speed_kmh"),
+            segments.c.points
+        ).where(
+            segments.c.seconds.is_(None) | not_sequential | (speed > 150)
+        ).order_by(segments.c.end_time)
+    )).all()
+    
+    total_points = rows[0].points if rows else 0
+    
+    if total_points < 2:
         return {
             "valid": True,
             "anomalies": [],
@@ -462,41 +712,27 @@ def validate_tracking_point_sequence(shipment_id: UUID, db: Session) -> dict:
     
     anomalies = []
     
-    for i in range(1, len(tracking_points)):
-        prev_point = tracking_points[i-1]
-        curr_point = tracking_points[i]
-        
-        # Check time sequence
-        if curr_point.recorded_at <= prev_point.recorded_at:
+    for row in rows:
+        if row.not_sequential is None:
+            continue
+        if row.not_sequential:
             anomalies.append({
                 "type": "time_sequence",
-                "point_id": curr_point.id,
+                "point_id": row.id,
                 "message": "Tracking point timestamp is not sequential"
             })
-        
-        # Calculate speed between points
-        distance = calculate_distance_km(
-            prev_point.x, prev_point.y,
-            curr_point.x, curr_point.y
-        )
-        
-        time_diff_hours = (curr_point.recorded_at - prev_point.recorded_at).total_seconds() / 3600
-        
-        if time_diff_hours > 0:
-            speed = distance / time_diff_hours
-            
-            # Check for impossible speeds (>150 km/h in urban delivery)
-            if speed > 150:
-                anomalies.append({
-                    "type": "impossible_speed",
-                    "point_id": curr_point.id,
-                    "speed_kmh": round(speed, 2),
-                    "message": f"Impossible speed detected: {speed:.0f} km/h"
-                })
+        else:
+            speed_kmh = float(row.speed_kmh)
+            anomalies.append({
+                "type": "impossible_speed",
+                "point_id": row.id,
+                "speed_kmh": round(speed_kmh, 2),
+                "message": f"Impossible speed detected: {speed_kmh:.0f} km/h"
+            })
     
     return {
         "valid": len(anomalies) == 0,
         "anomalies": anomalies,
-        "total_points_checked": len(tracking_points),
+        "total_points_checked": total_points,
         "message": "Validation complete" if len(anomalies) == 0 else f"Found {len(anomalies)} anomalies"
     }
\ No newline at end of file
@@ -1,13 +1,30 @@
-from typing import Optional, List
+from types import MappingProxyType
+from typing import Mapping, Optional, List
 from sqlalchemy import UUID
-from decimal import Decimal
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.vehicle_model import Vehicle, VehicleStatus, VehicleType
 from app.models.driver_model import Driver
 from app.models.shipment_model import Shipment
+from app.services._cache import async_ttl_cache
 
-def get_vehicle_utilization_rate(vehicle_id: UUID, db: Session) -> float:
+# Per-vehicle usage figures; dropped by the shipment routes whenever a
+# shipment is updated or (re)assigned
+VEHICLE_CACHE = "vehicle"
+VEHICLE_CACHE_TTL = 60
+
+# Maintenance thresholds (in km)
+MAINTENANCE_INTERVALS = MappingProxyType({
+    VehicleType.MOTORCYCLE: 3000,
+    VehicleType.VAN: 5000,
+    VehicleType.TRUCK: 8000,
+    VehicleType.PICKUP: 6000
+})
+DEFAULT_MAINTENANCE_INTERVAL = 5000
+
+@async_ttl_cache(VEHICLE_CACHE, ttl=VEHICLE_CACHE_TTL, maxsize=1024, key=lambda vehicle_id, db: (vehicle_id,))
+async def get_vehicle_utilization_rate(vehicle_id: UUID, db: AsyncSession) -> float:
     """
     Calculate vehicle utilization rate
     Returns percentage of time vehicle has been in use
@@ -19,14 +36,16 @@ def get_vehicle_utilization_rate(vehicle_id: UUID, db: Session) -> float:
     Returns:
         Utilization rate as percentage (0-100)
     """
-    vehicle = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
+    vehicle = await db.get(Vehicle, vehicle_id)
     if not vehicle:
         return 0.0
     
     # Get total deliveries for drivers who used this vehicle
-    total_deliveries = db.query(Shipment).join(
-        Driver, Shipment.driver_id == Driver.id
-    ).filter(Driver.vehicle_id == vehicle_id).count()
+    total_deliveries = await db.scalar(
+        select(func.count()).select_from(Shipment).join(
+            Driver, Shipment.driver_id == Driver.id
+        ).where(Driver.vehicle_id == vehicle_id)
+    )
     
     # Simple calculation: if vehicle has deliveries, it's being utilized
     # More complex: track hours used vs hours available
@@ -37,10 +56,10 @@ def get_vehicle_utilization_rate(vehicle_id: UUID, db: Session) -> float:
     # This is simplified - in production, track actual hours
     return min(100.0, (total_deliveries / 30) * 100)  # 30 deliveries = 100% utilized
 
-def get_optimal_vehicle_for_shipment(
-    weight_kg: Decimal,
-    distance_km: Decimal,
-    db: Session
+async def get_optimal_vehicle_for_shipment(
+    weight_kg: float,
+    distance_km: float,
+    db: AsyncSession
 ) -> Optional[Vehicle]:
     """
     Recommend the best vehicle for a shipment based on weight and distance
@@ -53,39 +72,31 @@ def get_optimal_vehicle_for_shipment(
     Returns:
         Recommended vehicle or None
     """
-    # Get available vehicles that can handle the weight
-    suitable_vehicles = db.query(Vehicle).filter(
-        Vehicle.status == VehicleStatus.AVAILABLE,
-        Vehicle.is_active == True,
-        Vehicle.capacity_kg >= weight_kg
-    ).all()
-    
-    if not suitable_vehicles:
-        return None
-    
     # Selection logic based on distance and weight
     if distance_km < 5 and weight_kg < 10:
         # Short distance, light package - prefer motorcycle
-        for vehicle in suitable_vehicles:
-            if vehicle.vehicle_type == VehicleType.MOTORCYCLE:
-                return vehicle
-    
+        preferred = [VehicleType.MOTORCYCLE]
     elif distance_km < 20 and weight_kg < 500:
         # Medium distance, medium weight - prefer van or pickup
-        for vehicle in suitable_vehicles:
-            if vehicle.vehicle_type in [VehicleType.VAN, VehicleType.PICKUP]:
-                return vehicle
-    
+        preferred = [VehicleType.VAN, VehicleType.PICKUP]
     else:
         # Long distance or heavy weight - prefer truck
-        for vehicle in suitable_vehicles:
-            if vehicle.vehicle_type == VehicleType.TRUCK:
-                return vehicle
-    
-    # If no perfect match, return the first suitable vehicle
-    return suitable_vehicles[0]
+        preferred = [VehicleType.TRUCK]
+    
+    # Available vehicles that can handle the weight, a preferred type first;
+    # if no perfect match, any suitable vehicle
+    return await db.scalar(
+        select(Vehicle).where(
+            Vehicle.status == VehicleStatus.AVAILABLE,
+            Vehicle.is_active == True,
+            Vehicle.capacity_kg >= weight_kg
+        ).order_by(
+            case((Vehicle.vehicle_type.in_(preferred), 0), else_=1)
+        ).limit(1)
+    )
 
-def calculate_vehicle_maintenance_score(vehicle_id: UUID, db: Session) -> dict:
+@async_ttl_cache(VEHICLE_CACHE, ttl=VEHICLE_CACHE_TTL, maxsize=1024, key=lambda vehicle_id, db: (vehicle_id,))
+async def calculate_vehicle_maintenance_score(vehicle_id: UUID, db: AsyncSession) -> dict:
     """
     Calculate when a vehicle might need maintenance based on usage
     
@@ -96,28 +107,20 @@ def calculate_vehicle_maintenance_score(vehicle_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with maintenance score and recommendation
     """
-    vehicle = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
+    vehicle = await db.get(Vehicle, vehicle_id)
     if not vehicle:
         return {"score": 0, "status": "unknown", "recommendation": "Vehicle not found"}
     
     # Get total distance covered by this vehicle
-    total_distance = db.query(Shipment).join(
-        Driver, Shipment.driver_id == Driver.id
-    ).filter(
-        Driver.vehicle_id == vehicle_id
-    ).with_entities(Shipment.estimated_distance_km).all()
+    total_km = await db.scalar(
+        select(func.coalesce(func.sum(Shipment.estimated_distance_km), 0)).join(
+            Driver, Shipment.driver_id == Driver.id
+        ).where(
+            Driver.vehicle_id == vehicle_id
+        )
+    )
     
-    total_km = sum([d[0] or 0 for d in total_distance])
-    
-    # Maintenance thresholds (in km)
-    MAINTENANCE_INTERVALS = {
-        VehicleType.MOTORCYCLE: 3000,
-        VehicleType.VAN: 5000,
-        VehicleType.TRUCK: 8000,
-        VehicleType.PICKUP: 6000
-    }
-    
-    interval = MAINTENANCE_INTERVALS.get(vehicle.vehicle_type, 5000)
+    interval = MAINTENANCE_INTERVALS.get(vehicle.vehicle_type, DEFAULT_MAINTENANCE_INTERVAL)
     
     # Calculate score (0-100, where 100 means maintenance is due)
     score = min(100, (total_km / interval) * 100)
@@ -143,7 +146,7 @@ def calculate_vehicle_maintenance_score(vehicle_id: UUID, db: Session) -> dict:
         "recommendation": recommendation
     }
 
-def get_vehicle_cost_efficiency(vehicle_id: UUID, db: Session) -> dict:
+async def get_vehicle_cost_efficiency(vehicle_id: UUID, db: AsyncSession) -> dict:
     """
     Calculate cost efficiency metrics for a vehicle
     
@@ -154,17 +157,21 @@ def get_vehicle_cost_efficiency(vehicle_id: UUID, db: Session) -> dict:
     Returns:
         Dictionary with cost efficiency metrics
     """
-    from sqlalchemy import func
-    
-    # Get all completed deliveries for this vehicle
-    deliveries = db.query(Shipment).join(
-        Driver, Shipment.driver_id == Driver.id
-    ).filter(
-        Driver.vehicle_id == vehicle_id,
-        Shipment.delivered_at.isnot(None)
-    ).all()
-    
-    if not deliveries:
+    # Aggregate all completed deliveries for this vehicle
+    total_deliveries, total_revenue, total_distance = (await db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(Shipment.effective_cost), 0),
+            func.coalesce(func.sum(Shipment.estimated_distance_km), 0)
+        ).join(
+            Driver, Shipment.driver_id == Driver.id
+        ).where(
+            Driver.vehicle_id == vehicle_id,
+            Shipment.delivered_at.isnot(None)
+        )
+    )).one()
+    
+    if not total_deliveries:
         return {
             "total_deliveries": 0,
             "total_revenue": 0,
@@ -173,10 +180,6 @@ def get_vehicle_cost_efficiency(vehicle_id: UUID, db: Session) -> dict:
             "revenue_per_delivery": 0
         }
     
-    total_revenue = sum([d.actual_cost or d.estimated_cost or 0 for d in deliveries])
-    total_distance = sum([d.estimated_distance_km or 0 for d in deliveries])
-    total_deliveries = len(deliveries)
-    
     return {
         "total_deliveries": total_deliveries,
         "total_revenue": round(total_revenue, 2),
@@ -186,7 +189,7 @@ def get_vehicle_cost_efficiency(vehicle_id: UUID, db: Session) -> dict:
         "average_distance_per_delivery": round(total_distance / total_deliveries, 2) if total_deliveries > 0 else 0
     }
 
-def check_vehicle_availability(vehicle_id: UUID, db: Session) -> dict:
+async def check_vehicle_availability(vehicle_id: UUID, db: AsyncSession) -> dict:
     """
     Check if a vehicle is available for assignment
     
@@ -199,7 +202,21 @@ def check_vehicle_availability(vehicle_id: UUID, db: Session) -> dict:
     """
     from app.models.shipment_model import ShipmentStatus
     
-    vehicle = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
+    # Vehicle state and its drivers' active shipments in one round trip
+    active_shipments = select(func.count()).select_from(Shipment).join(
+        Driver, Shipment.driver_id == Driver.id
+    ).where(
+        Driver.vehicle_id == Vehicle.id,
+        Shipment.status.in_([ShipmentStatus.IN_TRANSIT, ShipmentStatus.ASSIGNED])
+    ).scalar_subquery()
+    
+    vehicle = (await db.execute(
+        select(
+            Vehicle.is_active,
+            Vehicle.status,
+            active_shipments.label("active_shipments")
+        ).where(Vehicle.id == vehicle_id)
+    )).first()
     if not vehicle:
         return {
             "available": False,
@@ -220,58 +237,53 @@ def check_vehicle_availability(vehicle_id: UUID, db: Session) -> dict:
         }
     
     # Check if vehicle has a driver currently on active delivery
-    driver = db.query(Driver).filter(Driver.vehicle_id == vehicle_id).first()
-    if driver:
-        active_shipments = db.query(Shipment).filter(
-            Shipment.driver_id == driver.id,
-            Shipment.status.in_([ShipmentStatus.IN_TRANSIT, ShipmentStatus.ASSIGNED])
-        ).count()
-        
-        if active_shipments > 0:
-            return {
-                "available": False,
-                "reason": f"Vehicle's driver has {active_shipments} active shipment(s)",
-                "active_shipments": active_shipments
-            }
+    if vehicle.active_shipments > 0:
+        return {
+            "available": False,
+            "reason": f"Vehicle's driver has {vehicle.active_shipments} active shipment(s)",
+            "active_shipments": vehicle.active_shipments
+        }
     
     return {
         "available": True,
         "reason": "Vehicle is available for assignment"
     }
 
-# Vehicle type comparison helpers
-VEHICLE_CHARACTERISTICS = {
-    VehicleType.MOTORCYCLE: {
+# Vehicle type comparison helpers. Read-only, since every caller gets the
+# shared entry rather than a copy
+VEHICLE_CHARACTERISTICS = MappingProxyType({
+    VehicleType.MOTORCYCLE: MappingProxyType({
         "speed": "fast",
         "cost": "low",
         "capacity": "very_low",
         "fuel_efficiency": "excellent",
         "best_for": "Small packages, short distances, city delivery"
-    },
-    VehicleType.PICKUP: {
+    }),
+    VehicleType.PICKUP: MappingProxyType({
         "speed": "medium",
         "cost": "medium",
         "capacity": "medium",
         "fuel_efficiency": "good",
         "best_for": "Medium packages, versatile use"
-    },
-    VehicleType.VAN: {
+    }),
+    VehicleType.VAN: MappingProxyType({
         "speed": "medium",
         "cost": "medium",
         "capacity": "high",
         "fuel_efficiency": "fair",
         "best_for": "Multiple packages, urban delivery"
-    },
-    VehicleType.TRUCK: {
+    }),
+    VehicleType.TRUCK: MappingProxyType({
         "speed": "slow",
         "cost": "high",
         "capacity": "very_high",
         "fuel_efficiency": "poor",
         "best_for": "Heavy/bulk items, long distance"
-    }
-}
+    })
+})
+NO_CHARACTERISTICS = MappingProxyType({})
 
-def get_vehicle_characteristics(vehicle_type: VehicleType) -> dict:
+def get_vehicle_characteristics(vehicle_type: VehicleType) -> Mapping[str, str]:
     """
     Get characteristics and best use cases for a vehicle type
     
@@ -281,4 +293,4 @@ def get_vehicle_characteristics(vehicle_type: VehicleType) -> dict:
     Returns:
         Dictionary with vehicle characteristics
     """
-    return VEHICLE_CHARACTERISTICS.get(vehicle_type, {})
\ No newline at end of file
+    return VEHICLE_CHARACTERISTICS.get(vehicle_type, NO_CHARACTERISTICS)
\ No newline at end of file
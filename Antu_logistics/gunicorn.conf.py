@@ -0,0 +1,25 @@
+# Gunicorn settings for production:
+#   gunicorn -c gunicorn.conf.py app.main:app
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master and fork workers from it, so module
+# state (settings, mapper configuration) is shared copy-on-write
+preload_app = True
+
+keepalive = 5
+timeout = 30
+graceful_timeout = 30
+
+
+def post_fork(server, worker):
+    # Connection pools created in the master must not be shared with the
+    # children; drop the inherited ones without closing the master's sockets
+    from app.database import async_engine, engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
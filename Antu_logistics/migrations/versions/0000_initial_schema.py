@@ -0,0 +1,125 @@
+"""Initial schema
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+import geoalchemy2
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('phone', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.Enum('ADMIN', 'LOGISTICS_MANAGER', 'DRIVER', 'CUSTOMER', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_phone'), 'users', ['phone'], unique=True)
+    op.create_table('vehicles',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('plate_number', sa.String(), nullable=False),
+    sa.Column('vehicle_type', sa.Enum('MOTORCYCLE', 'VAN', 'TRUCK', 'PICKUP', name='vehicletype'), nullable=False),
+    sa.Column('model', sa.String(), nullable=True),
+    sa.Column('fuel_rate_per_km', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('capacity_kg', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('status', sa.Enum('AVAILABLE', 'IN_USE', 'MAINTENANCE', 'INACTIVE', name='vehiclestatus'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vehicles_plate_number'), 'vehicles', ['plate_number'], unique=True)
+    op.create_table('drivers',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('vehicle_id', sa.UUID(), nullable=True),
+    sa.Column('license_number', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('AVAILABLE', 'ON_DUTY', 'OFF_DUTY', name='driverstatus'), nullable=True),
+    sa.Column('location', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, dimension=2, from_text='ST_GeogFromText', name='geography'), nullable=True),
+    sa.Column('last_location_update', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['vehicle_id'], ['vehicles.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('license_number'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_table('shipments',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('tracking_number', sa.String(), nullable=False),
+    sa.Column('shipper_id', sa.UUID(), nullable=False),
+    sa.Column('driver_id', sa.UUID(), nullable=True),
+    sa.Column('origin', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, dimension=2, from_text='ST_GeogFromText', name='geography', nullable=False), nullable=False),
+    sa.Column('destination', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, dimension=2, from_text='ST_GeogFromText', name='geography', nullable=False), nullable=False),
+    sa.Column('package_description', sa.Text(), nullable=True),
+    sa.Column('weight_kg', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('volume_m3', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('status', sa.Enum('CREATED', 'ASSIGNED', 'IN_TRANSIT', 'DELIVERED', 'DELAYED', 'CANCELLED', name='shipmentstatus'), nullable=True),
+    sa.Column('estimated_distance_km', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('estimated_cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('actual_cost', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('assigned_at', sa.DateTime(), nullable=True),
+    sa.Column('picked_up_at', sa.DateTime(), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('recipient_name', sa.String(), nullable=False),
+    sa.Column('recipient_phone', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['driver_id'], ['drivers.id'], ),
+    sa.ForeignKeyConstraint(['shipper_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_shipments_tracking_number'), 'shipments', ['tracking_number'], unique=True)
+    op.create_table('tracking_points',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('shipment_id', sa.UUID(), nullable=False),
+    sa.Column('location', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, dimension=2, from_text='ST_GeogFromText', name='geography', nullable=False), nullable=False),
+    sa.Column('speed_kmh', sa.Float(), nullable=True),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.Column('notes', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['shipment_id'], ['shipments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tracking_points_recorded_at'), 'tracking_points', ['recorded_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tracking_points_recorded_at'), table_name='tracking_points')
+    op.drop_table('tracking_points')
+    op.drop_index(op.f('ix_shipments_tracking_number'), table_name='shipments')
+    op.drop_table('shipments')
+    op.drop_table('drivers')
+    op.drop_index(op.f('ix_vehicles_plate_number'), table_name='vehicles')
+    op.drop_table('vehicles')
+    op.drop_index(op.f('ix_users_phone'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    sa.Enum(name='shipmentstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='driverstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='vehiclestatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='vehicletype').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,52 @@
+"""GiST indexes on geography columns
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = "0000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same names GeoAlchemy2 gives the indexes it emits from the models, so a
+# database built by create_all is left untouched
+SPATIAL_COLUMNS = [
+    ("drivers", "location"),
+    ("shipments", "origin"),
+    ("shipments", "destination"),
+    ("tracking_points", "location"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, column in SPATIAL_COLUMNS:
+            op.create_index(
+                f"idx_{table}_{column}",
+                table,
+                [column],
+                postgresql_using="gist",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, column in SPATIAL_COLUMNS:
+            op.drop_index(
+                f"idx_{table}_{column}",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,42 @@
+"""Cluster tracking_points by geohash
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+
+Tracking points arrive in time order but are read by area, so without
+clustering a spatial range scan is spread over many heap pages. CLUSTER is
+a one-off rewrite: new rows are appended in insert order again, so re-run
+it periodically (e.g. nightly from pg_cron):
+
+    SELECT cron.schedule('cluster-tracking-points', '0 3 * * *',
+                         'CLUSTER tracking_points');
+
+CLUSTER takes an ACCESS EXCLUSIVE lock on the table while it runs.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS tp_geohash_idx "
+        "ON tracking_points (ST_GeoHash(location::geometry, 10))"
+    )
+    op.execute("CLUSTER tracking_points USING tp_geohash_idx")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE tracking_points SET WITHOUT CLUSTER")
+    op.execute("DROP INDEX IF EXISTS tp_geohash_idx")
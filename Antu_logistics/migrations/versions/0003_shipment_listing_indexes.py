@@ -0,0 +1,50 @@
+"""Composite indexes for shipment listing
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# list_shipments filters on one of these columns and orders by created_at DESC
+LISTING_INDEXES = [
+    ("ix_shipments_shipper_created", "shipper_id"),
+    ("ix_shipments_driver_created", "driver_id"),
+    ("ix_shipments_status_created", "status"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, column in LISTING_INDEXES:
+            op.create_index(
+                name,
+                "shipments",
+                [column, sa.text("created_at DESC")],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in LISTING_INDEXES:
+            op.drop_index(
+                name,
+                table_name="shipments",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
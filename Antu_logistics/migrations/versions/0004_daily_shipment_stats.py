@@ -0,0 +1,50 @@
+"""Materialized view of daily shipment totals
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+
+Backs the executive summary and revenue forecast. The view is only as fresh
+as its last refresh; schedule one every few minutes, e.g. with pg_cron:
+
+    SELECT cron.schedule('refresh-daily-shipment-stats', '*/5 * * * *',
+                         'REFRESH MATERIALIZED VIEW CONCURRENTLY mv_daily_shipment_stats');
+
+REFRESH ... CONCURRENTLY needs the unique index created below.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_shipment_stats AS
+        SELECT date_trunc('day', created_at) AS day,
+               status,
+               count(*) AS shipments,
+               coalesce(sum(actual_cost), 0) AS actual_cost,
+               coalesce(sum(coalesce(actual_cost, estimated_cost, 0)), 0) AS revenue
+        FROM shipments
+        GROUP BY 1, 2
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_mv_daily_shipment_stats_day_status "
+        "ON mv_daily_shipment_stats (day, status)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_shipment_stats")
@@ -0,0 +1,59 @@
+"""Time-ordered UUIDs for shipments and tracking points
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15
+
+Random v4 keys scatter inserts across the primary key index. UUIDv7 puts a
+millisecond timestamp in the leading bits, so new rows land at the right
+edge of the index. Postgres 18 ships uuidv7(); this function does the same
+on older servers.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["shipments", "tracking_points"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 48-bit unix-ms timestamp over the first 6 bytes of a random UUID, then
+    # set the version nibble to 7 (bits 52/53; the variant bits are kept)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            placing substring(int8send(floor(extract(epoch from clock_timestamp()) * 1000)::bigint) from 3)
+                            from 1 for 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT uuid_generate_v7()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
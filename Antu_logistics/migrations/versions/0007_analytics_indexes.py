@@ -0,0 +1,64 @@
+"""Indexes for analytics filters
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fleet efficiency counts active vehicles / drivers per status
+FLEET_INDEXES = [
+    ("ix_vehicles_active_status", "vehicles"),
+    ("ix_drivers_active_status", "drivers"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Delivery performance only ever reads timings of delivered shipments
+        op.create_index(
+            "ix_shipments_delivered_times",
+            "shipments",
+            ["picked_up_at", "delivered_at"],
+            postgresql_where=sa.text("status = 'DELIVERED'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table in FLEET_INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["is_active", "status"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table in FLEET_INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        op.drop_index(
+            "ix_shipments_delivered_times",
+            table_name="shipments",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,49 @@
+"""Materialized view of per-driver efficiency totals
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-15
+
+Backs the driver efficiency score. Like mv_daily_shipment_stats it needs a
+scheduled refresh, e.g. with pg_cron:
+
+    SELECT cron.schedule('refresh-driver-efficiency', '* * * * *',
+                         'REFRESH MATERIALIZED VIEW CONCURRENTLY mv_driver_efficiency');
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_driver_efficiency AS
+        SELECT driver_id,
+               count(*) AS total,
+               count(*) FILTER (WHERE status = 'DELIVERED') AS delivered,
+               count(*) FILTER (WHERE status = 'CANCELLED') AS cancelled,
+               coalesce(sum(estimated_distance_km) FILTER (WHERE status = 'DELIVERED'), 0) AS distance_km
+        FROM shipments
+        WHERE driver_id IS NOT NULL
+        GROUP BY driver_id
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_mv_driver_efficiency_driver "
+        "ON mv_driver_efficiency (driver_id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_driver_efficiency")
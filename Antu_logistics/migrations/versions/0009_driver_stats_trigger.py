@@ -0,0 +1,120 @@
+"""Trigger-maintained per-driver efficiency totals
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-15
+
+Replaces mv_driver_efficiency: instead of re-aggregating all shipments on
+every refresh, a row trigger on shipments moves the old row's contribution
+out of driver_stats and the new row's in. Unschedule the
+refresh-driver-efficiency pg_cron job before upgrading.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same shape as the view it replaces (0008)
+DRIVER_EFFICIENCY_VIEW = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_driver_efficiency AS
+    SELECT driver_id,
+           count(*) AS total,
+           count(*) FILTER (WHERE status = 'DELIVERED') AS delivered,
+           count(*) FILTER (WHERE status = 'CANCELLED') AS cancelled,
+           coalesce(sum(estimated_distance_km) FILTER (WHERE status = 'DELIVERED'), 0) AS distance_km
+    FROM shipments
+    WHERE driver_id IS NOT NULL
+    GROUP BY driver_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Hold off shipment writes until the backfill and trigger are in place
+    op.execute("LOCK TABLE shipments IN SHARE MODE")
+    op.execute(
+        """
+        CREATE TABLE driver_stats (
+            driver_id uuid PRIMARY KEY REFERENCES drivers (id) ON DELETE CASCADE,
+            total integer NOT NULL DEFAULT 0,
+            delivered integer NOT NULL DEFAULT 0,
+            cancelled integer NOT NULL DEFAULT 0,
+            distance_km numeric NOT NULL DEFAULT 0
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO driver_stats (driver_id, total, delivered, cancelled, distance_km)
+        SELECT driver_id,
+               count(*),
+               count(*) FILTER (WHERE status = 'DELIVERED'),
+               count(*) FILTER (WHERE status = 'CANCELLED'),
+               coalesce(sum(estimated_distance_km) FILTER (WHERE status = 'DELIVERED'), 0)
+        FROM shipments
+        WHERE driver_id IS NOT NULL
+        GROUP BY driver_id
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION shipments_driver_stats() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.driver_id IS NOT NULL THEN
+                UPDATE driver_stats SET
+                    total = total - 1,
+                    delivered = delivered - coalesce(OLD.status = 'DELIVERED', false)::int,
+                    cancelled = cancelled - coalesce(OLD.status = 'CANCELLED', false)::int,
+                    distance_km = distance_km - CASE WHEN OLD.status = 'DELIVERED'
+                        THEN coalesce(OLD.estimated_distance_km, 0) ELSE 0 END
+                WHERE driver_id = OLD.driver_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.driver_id IS NOT NULL THEN
+                INSERT INTO driver_stats AS s (driver_id, total, delivered, cancelled, distance_km)
+                VALUES (
+                    NEW.driver_id,
+                    1,
+                    coalesce(NEW.status = 'DELIVERED', false)::int,
+                    coalesce(NEW.status = 'CANCELLED', false)::int,
+                    CASE WHEN NEW.status = 'DELIVERED'
+                        THEN coalesce(NEW.estimated_distance_km, 0) ELSE 0 END
+                )
+                ON CONFLICT (driver_id) DO UPDATE SET
+                    total = s.total + EXCLUDED.total,
+                    delivered = s.delivered + EXCLUDED.delivered,
+                    cancelled = s.cancelled + EXCLUDED.cancelled,
+                    distance_km = s.distance_km + EXCLUDED.distance_km;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER shipments_driver_stats
+        AFTER INSERT OR DELETE OR UPDATE OF driver_id, status, estimated_distance_km ON shipments
+        FOR EACH ROW EXECUTE FUNCTION shipments_driver_stats()
+        """
+    )
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_driver_efficiency")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(DRIVER_EFFICIENCY_VIEW)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_mv_driver_efficiency_driver "
+        "ON mv_driver_efficiency (driver_id)"
+    )
+    op.execute("DROP TRIGGER IF EXISTS shipments_driver_stats ON shipments")
+    op.execute("DROP FUNCTION IF EXISTS shipments_driver_stats()")
+    op.execute("DROP TABLE IF EXISTS driver_stats")
@@ -0,0 +1,59 @@
+"""Indexes for per-driver shipment aggregates
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Daily summary: a driver's pickups / deliveries within a day
+DAY_RANGE_INDEXES = [
+    ("ix_shipments_driver_picked_up", "picked_up_at"),
+    ("ix_shipments_driver_delivered", "delivered_at"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Active workload and the nearest-driver capacity check count and sum
+        # a driver's shipments by status without touching the heap
+        op.create_index(
+            "ix_shipments_driver_status",
+            "shipments",
+            ["driver_id", "status"],
+            postgresql_include=["estimated_distance_km"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, column in DAY_RANGE_INDEXES:
+            op.create_index(
+                name,
+                "shipments",
+                ["driver_id", column],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.execute("ANALYZE shipments")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in ["ix_shipments_driver_status"] + [name for name, _ in DAY_RANGE_INDEXES]:
+            op.drop_index(
+                name,
+                table_name="shipments",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,47 @@
+"""Index tracking points by shipment in recording order
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-15
+
+Every per-shipment tracking read filters on shipment_id and walks the points
+by recorded_at (LAG windows, ST_MakeLine ORDER BY, MAX(recorded_at) for the
+cache version, the newest point for the summary). With this index those are
+ordered range scans with no sort step.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tracking_points_shipment_recorded",
+            "tracking_points",
+            ["shipment_id", "recorded_at"],
+            postgresql_include=["speed_kmh"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.execute("ANALYZE tracking_points")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tracking_points_shipment_recorded",
+            table_name="tracking_points",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,43 @@
+"""Store each shipment's route as a generated geography column
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-15
+
+Route deviation is measured against the straight origin -> destination line.
+Storing it as a generated column means the line is built once per write
+instead of on every GPS ping. Adding a stored generated column rewrites
+shipments under an ACCESS EXCLUSIVE lock, so run this off-peak.
+
+"""
+from typing import Sequence, Union
+
+import geoalchemy2
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, Sequence[str], None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROUTE_EXPRESSION = "ST_MakeLine(origin::geometry, destination::geometry)::geography"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "shipments",
+        sa.Column(
+            "route",
+            geoalchemy2.types.Geography(geometry_type="LINESTRING", srid=4326, spatial_index=False),
+            sa.Computed(ROUTE_EXPRESSION, persisted=True),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("shipments", "route")